@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Streaming batch calculation over CSV or NDJSON files of operation,a,b rows.
+Rows are read lazily and calculated in fixed-size chunks, so memory stays
+constant regardless of the input size.
+"""
+
+from dataclasses import dataclass
+from itertools import islice
+from typing import Iterator, TextIO
+from calculator import Calculator
+import numpy as np
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FORMATS = ("csv", "ndjson")
+
+@dataclass
+class PipelineStats:
+    """Counters for a pipeline run."""
+    rows: int = 0
+    results: int = 0
+    errors: int = 0
+
+@dataclass
+class Row:
+    """A single input row."""
+    line: int
+    operation: str
+    a: str
+    b: str
+
+def detect_format(path: str) -> str:
+    """
+    Detects the file format from its extension.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return "csv"
+    if extension in (".ndjson", ".jsonl", ".json"):
+        return "ndjson"
+    raise ValueError(f"Cannot detect format of {path}, expected one of {FORMATS}")
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[Row]:
+    """
+    Lazily reads operation,a,b rows. A leading CSV header is skipped.
+    """
+    if fmt == "csv":
+        for line, record in enumerate(csv.reader(stream), start=1):
+            if not record or (line == 1 and record[0] == "operation"):
+                continue
+            record += [""] * (3 - len(record))
+            yield Row(line, record[0], record[1], record[2])
+    else:
+        for line, text in enumerate(stream, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+                yield Row(line, record.get("operation", ""), record.get("a", ""), record.get("b", ""))
+            except (ValueError, AttributeError):
+                yield Row(line, "", "", "")
+
+class RowWriter:
+    """
+    Writes result or error records in the given format.
+    """
+    def __init__(self, stream: TextIO, fmt: str, fields: list[str]):
+        self.stream = stream
+        self.fmt = fmt
+        self.fields = fields
+        if fmt == "csv":
+            self._csv = csv.writer(stream)
+            self._csv.writerow(fields)
+
+    def write(self, values: list) -> None:
+        if self.fmt == "csv":
+            self._csv.writerow(values)
+        else:
+            self.stream.write(json.dumps(dict(zip(self.fields, values))) + "\n")
+
+def calculate_group(calculator: Calculator, operation: str, a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, dict[int, str]]:
+    """
+    Calculates one operation over arrays with a single calculate_batch call.
+    Rows that come back as NaN (or masked) from non-NaN inputs, or every row
+    when the batch raises, are re-run individually to get their error message.
+
+    Returns:
+        tuple[np.ndarray, dict[int, str]]: The results and the error message
+        of each failed row by index.
+    """
+    try:
+        values = np.ma.filled(calculator.calculate_batch(operation, a, b), np.nan)
+        retry = np.isnan(values) & ~np.isnan(a) & ~np.isnan(b)
+    except ValueError:
+        values = np.full(len(a), np.nan)
+        retry = np.ones(len(a), dtype=bool)
+    failures = {}
+    indices = np.flatnonzero(retry)
+    if len(indices):
+        operation_obj = calculator.factory.create_operation(operation)
+        for index in indices.tolist():
+            try:
+                values[index] = operation_obj.execute(float(a[index]), float(b[index]))
+            except Exception as e:
+                failures[index] = str(e)
+    return values, failures
+
+def _calculate_chunk(calculator: Calculator, chunk: list[Row], results: RowWriter, errors: RowWriter, stats: PipelineStats) -> None:
+    """
+    Calculates one chunk, one calculate_batch call per operation.
+    Rows that fail are re-run individually to report their error message.
+    """
+    groups: dict[str, list[tuple[Row, float, float]]] = {}
+    supported = set(calculator.get_supported_operations())
+    for row in chunk:
+        if row.operation not in supported:
+            errors.write([row.line, row.operation, row.a, row.b,
+                          f"{calculator.config.errors.unknown_operation}: {row.operation}"])
+            stats.errors += 1
+            continue
+        try:
+            groups.setdefault(row.operation, []).append((row, float(row.a), float(row.b)))
+        except (TypeError, ValueError):
+            errors.write([row.line, row.operation, row.a, row.b, calculator.config.errors.invalid_expression])
+            stats.errors += 1
+
+    for operation, items in groups.items():
+        a = np.fromiter((item[1] for item in items), dtype=np.float64, count=len(items))
+        b = np.fromiter((item[2] for item in items), dtype=np.float64, count=len(items))
+        values, failures = calculate_group(calculator, operation, a, b)
+        for index, (row, x, y) in enumerate(items):
+            if index in failures:
+                errors.write([row.line, row.operation, row.a, row.b, failures[index]])
+                stats.errors += 1
+                continue
+            results.write([row.operation, x, y, float(values[index])])
+            stats.results += 1
+
+def process_stream(calculator: Calculator, source: TextIO, output: TextIO, errors: TextIO,
+                   input_format: str, output_format: str, chunk_size: int = 10000) -> PipelineStats:
+    """
+    Streams rows from source through the calculator into output.
+    Per-row errors go to the errors stream and do not abort the run.
+
+    Args:
+        calculator (Calculator): The calculator to use.
+        source (TextIO): The input stream of operation,a,b rows.
+        output (TextIO): The stream results are written to.
+        errors (TextIO): The side channel per-row errors are written to.
+        input_format (str): The input format, csv or ndjson.
+        output_format (str): The format of the output and errors streams.
+        chunk_size (int): The number of rows calculated at once.
+
+    Returns:
+        PipelineStats: Counters for the run.
+    """
+    stats = PipelineStats()
+    results_writer = RowWriter(output, output_format, ["operation", "a", "b", "result"])
+    errors_writer = RowWriter(errors, output_format, ["line", "operation", "a", "b", "error"])
+    rows = read_rows(source, input_format)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        stats.rows += len(chunk)
+        _calculate_chunk(calculator, chunk, results_writer, errors_writer, stats)
+    return stats
+
+def process_file(calculator: Calculator, input_path: str, output_path: str, errors_path: str | None = None,
+                 chunk_size: int = 10000) -> PipelineStats:
+    """
+    Streams an input file through the calculator into an output file.
+    Formats are detected from the file extensions; errors are written to
+    errors_path, or to stderr when it is not given.
+    """
+    input_format = detect_format(input_path)
+    output_format = detect_format(output_path)
+    with open(input_path, "r", newline="") as source, open(output_path, "w", newline="") as output:
+        if errors_path is None:
+            return process_stream(calculator, source, output, sys.stderr, input_format, output_format, chunk_size)
+        with open(errors_path, "w", newline="") as errors:
+            return process_stream(calculator, source, output, errors, input_format, output_format, chunk_size)
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Stream operation,a,b rows through the calculator.")
+    parser.add_argument("input", help="Input file (.csv or .ndjson)")
+    parser.add_argument("output", help="Output file (.csv or .ndjson)")
+    parser.add_argument("--errors", help="File for per-row errors (defaults to stderr)")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "calculator.yaml"),
+                        help="Calculator YAML config")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="Rows calculated per chunk")
+    args = parser.parse_args(argv)
+
+    stats = process_file(Calculator(args.config), args.input, args.output, args.errors, args.chunk_size)
+    logger.info(f"Processed {stats.rows} rows: {stats.results} results, {stats.errors} errors")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Benchmark and regression suite for the calculator.
+
+Measures cold Calculator construction, per-call calculate() cost for each
+operation, error paths, and the batch/vectorized paths, and writes the
+results as JSON. With --compare, fails when any metric regresses beyond
+the threshold against a saved baseline. Every metric is a time per unit,
+so lower is better.
+"""
+
+from datetime import datetime, timezone
+from calculator import Calculator
+from calculator_config import snapshot_path_for
+from result_cache import ResultCache
+import numpy as np
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import timeit
+
+DEFAULT_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "calculator.yaml")
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+def _best(function, number: int, repeat: int) -> float:
+    """
+    Returns the best time in seconds of one call to function.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+def _expect_error(function):
+    def call():
+        try:
+            function()
+        except ValueError:
+            pass
+    return call
+
+def run_suite(config_path: str, scale: float = 1.0, repeat: int = 5) -> dict[str, float]:
+    """
+    Runs every benchmark.
+
+    Args:
+        config_path (str): The calculator YAML config.
+        scale (float): Multiplier for the number of iterations.
+        repeat (int): Repetitions per benchmark; the best is kept.
+
+    Returns:
+        dict[str, float]: Metric name to nanoseconds per unit.
+    """
+    def n(count: int) -> int:
+        return max(1, int(count * scale))
+
+    metrics = {}
+    snapshot_path = snapshot_path_for(config_path)
+
+    def init_from_yaml():
+        if os.path.exists(snapshot_path):
+            os.remove(snapshot_path)
+        Calculator(config_path)
+
+    metrics["init.yaml.ns"] = _best(init_from_yaml, n(20), repeat) * 1e9
+    Calculator(config_path)
+    metrics["init.snapshot.ns"] = _best(lambda: Calculator(config_path), n(200), repeat) * 1e9
+
+    calculator = Calculator(config_path)
+    for operation in OPERATIONS:
+        calculator.calculate(operation, 1.0, 1.0)
+    cache = calculator.cache
+    # Per-call cost without memoization: every call runs the operation
+    calculator.cache = None
+    for operation in OPERATIONS:
+        metrics[f"calculate.{operation}.ns"] = _best(
+            lambda: calculator.calculate(operation, 10.0, 3.0), n(50_000), repeat) * 1e9
+    # The cached path is measured even when the config leaves the cache off
+    calculator.cache = cache or ResultCache(calculator.config.cache.max_size, calculator.config.cache.eviction_policy)
+    metrics["calculate.cached.ns"] = _best(lambda: calculator.calculate("add", 10.0, 3.0), n(50_000), repeat) * 1e9
+
+    metrics["error.division_by_zero.ns"] = _best(
+        _expect_error(lambda: calculator.calculate("divide", 1.0, 0.0)), n(20_000), repeat) * 1e9
+    metrics["error.unknown_operation.ns"] = _best(
+        _expect_error(lambda: calculator.calculate("modulo", 1.0, 2.0)), n(20_000), repeat) * 1e9
+
+    metrics["evaluate.ns"] = _best(lambda: calculator.evaluate("3 * (4 + 2) / 7"), n(20_000), repeat) * 1e9
+
+    rows = n(1_000_000)
+    rng = np.random.default_rng(0)
+    a = rng.uniform(-1000.0, 1000.0, rows)
+    b = rng.uniform(1.0, 1000.0, rows)
+    for operation in OPERATIONS:
+        metrics[f"calculate_batch.{operation}.ns_per_row"] = _best(
+            lambda: calculator.calculate_batch(operation, a, b), 1, repeat) / rows * 1e9
+    columns = {"a": a, "b": b, "c": b, "d": b}
+    metrics["evaluate_columns.ns_per_row"] = _best(
+        lambda: calculator.evaluate_columns("(a + b) * c / d", columns), 1, repeat) / rows * 1e9
+    metrics["reduce.add.ns_per_item"] = _best(lambda: calculator.reduce("add", a), 1, repeat) / rows * 1e9
+    return metrics
+
+def compare(current: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    Lists the metrics that are slower than the baseline by more than threshold
+    (e.g. 0.1 for 10%). Metrics missing from either side are ignored.
+    """
+    regressions = []
+    for name, value in sorted(current.items()):
+        previous = baseline.get(name)
+        if previous and value > previous * (1 + threshold):
+            regressions.append(f"{name}: {previous:.1f} -> {value:.1f} ({(value / previous - 1) * 100:+.1f}%)")
+    return regressions
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Calculator benchmark and regression suite.")
+    parser.add_argument("--config", default=DEFAULT_CONFIG)
+    parser.add_argument("--output", help="Write results as JSON to this file (defaults to stdout)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown, e.g. 0.10 for 10%%")
+    parser.add_argument("--scale", type=float, default=1.0, help="Scale iteration counts (e.g. 0.1 for a quick run)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    # Error-path benchmarks would otherwise log every failure
+    logging.getLogger("calculator").setLevel(logging.CRITICAL)
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "metrics": run_suite(args.config, args.scale, args.repeat),
+    }
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["metrics"]
+        regressions = compare(results["metrics"], baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the cost of metrics on Calculator.calculate.
+Compares a calculator that never enabled metrics, one that enabled and then
+disabled them, and one with metrics enabled.
+"""
+
+import argparse
+import os
+import timeit
+from calculator import Calculator
+
+def time_modes(calculators: dict[str, Calculator], calls: int, repeat: int) -> dict[str, float]:
+    """
+    Returns the best time per calculate() call in nanoseconds for each mode.
+    Modes are timed in alternation so machine noise hits them evenly.
+    """
+    best = {mode: float("inf") for mode in calculators}
+    for _ in range(repeat):
+        for mode, calculator in calculators.items():
+            calculate = calculator.calculate
+            seconds = timeit.timeit(lambda: calculate("add", 5.0, 3.0), number=calls)
+            best[mode] = min(best[mode], seconds / calls * 1e9)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metrics overhead on calculate().")
+    parser.add_argument("--calls", type=int, default=200_000)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "calculator.yaml"))
+    args = parser.parse_args()
+
+    baseline = Calculator(args.config)
+    disabled = Calculator(args.config)
+    disabled.enable_metrics()
+    disabled.disable_metrics()
+    enabled = Calculator(args.config)
+    enabled.enable_metrics()
+
+    timings = time_modes({"baseline": baseline, "disabled": disabled, "enabled": enabled}, args.calls, args.repeat)
+    print(f"{'mode':>10} {'ns/call':>10} {'overhead':>10}")
+    for mode, ns in timings.items():
+        print(f"{mode:>10} {ns:>10.1f} {(ns / timings['baseline'] - 1) * 100:>9.1f}%")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark for Calculator.calculate_parallel.
+Shows throughput scaling from 1 to N worker processes.
+"""
+
+import argparse
+import os
+import time
+import numpy as np
+from calculator import Calculator
+
+def run_benchmark(config_path: str, rows: int, max_workers: int, repeat: int) -> list[tuple[int, float]]:
+    """
+    Times calculate_parallel for 1..max_workers workers.
+
+    Returns:
+        list[tuple[int, float]]: (workers, best seconds) pairs.
+    """
+    rng = np.random.default_rng(0)
+    a = rng.uniform(-1000.0, 1000.0, rows)
+    b = rng.uniform(1.0, 1000.0, rows)
+    calculator = Calculator(config_path)
+    timings = []
+    try:
+        for workers in range(1, max_workers + 1):
+            # Warm up the pool so worker start-up is not measured
+            calculator.calculate_parallel("divide", a[:workers], b[:workers], workers=workers)
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                calculator.calculate_parallel("divide", a, b, workers=workers)
+                best = min(best, time.perf_counter() - start)
+            timings.append((workers, best))
+    finally:
+        calculator.close()
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parallel batch calculation scaling.")
+    parser.add_argument("--rows", type=int, default=20_000_000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "calculator.yaml"))
+    args = parser.parse_args()
+
+    timings = run_benchmark(args.config, args.rows, args.workers, args.repeat)
+    baseline = timings[0][1]
+    print(f"{'workers':>8} {'seconds':>10} {'Mrows/s':>10} {'speedup':>8}")
+    for workers, seconds in timings:
+        print(f"{workers:>8} {seconds:>10.4f} {args.rows / seconds / 1e6:>10.2f} {baseline / seconds:>8.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark for one Calculator shared across a thread pool.
+Reports calculate() throughput from 1 to N threads. Run it on a
+free-threaded (no-GIL) CPython build to see the lock-free read path scale.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from calculator import Calculator
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+def _worker(calculator: Calculator, calls: int, offset: int) -> None:
+    calculate = calculator.calculate
+    for i in range(calls):
+        calculate(OPERATIONS[i & 3], float(offset + i), 3.0)
+
+def run_benchmark(calculator: Calculator, calls: int, max_threads: int, repeat: int) -> list[tuple[int, float]]:
+    """
+    Times `calls` calculate() calls per thread for 1..max_threads threads.
+
+    Returns:
+        list[tuple[int, float]]: (threads, best calls per second) pairs.
+    """
+    results = []
+    for threads in range(1, max_threads + 1):
+        best = 0.0
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            for _ in range(repeat):
+                start = time.perf_counter()
+                # Distinct operands per thread so the result cache does not serve every call
+                list(pool.map(_worker, [calculator] * threads, [calls] * threads, range(0, threads * calls, calls)))
+                best = max(best, threads * calls / (time.perf_counter() - start))
+        results.append((threads, best))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark calculate() across threads.")
+    parser.add_argument("--calls", type=int, default=100_000, help="Calls per thread")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "calculator.yaml"))
+    args = parser.parse_args()
+
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"Python {sys.version.split()[0]}, GIL {'enabled' if is_gil_enabled else 'disabled (free-threaded)'}")
+    results = run_benchmark(Calculator(args.config), args.calls, args.threads, args.repeat)
+    baseline = results[0][1]
+    print(f"{'threads':>8} {'calls/s':>12} {'scaling':>8}")
+    for threads, rate in results:
+        print(f"{threads:>8} {rate:>12.0f} {rate / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
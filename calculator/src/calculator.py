@@ -1,47 +1,203 @@
-from calculator_config import load_config_from_yaml, load_calculator_config
+from calculator_config import load_calculator_config_snapshot
 from operation_factory import OperationFactory
-from add import Add
-from substract import Substract
-from mul import Multiply
-from divide import Divide
+from expression_parser import ExpressionParser
+from result_cache import ResultCache, CacheStats, MISSING
+from metrics import Metrics, OperationStats
+from array import array
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Iterator
+from time import perf_counter
+import numpy as np
 import logging
 
+if TYPE_CHECKING:
+    from parallel_runner import ParallelRunner
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class Calculator:
     def __init__(self, config_path: str):
-        self.config = load_calculator_config(load_config_from_yaml(config_path))
+        self.config_path = config_path
+        self.config = load_calculator_config_snapshot(config_path)
         self.factory = OperationFactory(self.config)
+        self.cache: ResultCache | None = None
+        if self.config.cache.enabled:
+            self.cache = ResultCache(self.config.cache.max_size, self.config.cache.eviction_policy)
+        # Also covers a cache assigned after construction
+        self.factory.add_register_listener(lambda operation_type: self.clear_cache())
         self._register_operations()
+        self.parser = ExpressionParser(self.config)
+        self._compile = lru_cache(maxsize=self.config.expression.cache_size)(self.parser.compile)
+        self._runner: "ParallelRunner | None" = None
+        self.metrics: Metrics | None = None
+        if self.config.metrics.enabled:
+            self.enable_metrics()
     
     def _register_operations(self):
-        """Register all available operations with the factory."""
-        # Register each operation with the full CalculatorConfig
-        for op_name in self.config.operations.keys():
-            if op_name == "add":
-                operation = Add(self.config)
-            elif op_name == "subtract":
-                operation = Substract(self.config)
-            elif op_name == "multiply":
-                operation = Multiply(self.config)
-            elif op_name == "divide":
-                operation = Divide(self.config)
-            else:
+        """Register all configured operations with the factory, to be imported on first use."""
+        for op_name, op_config in self.config.operations.items():
+            if op_config.import_path is None and op_config.entry_point is None:
                 continue
-            
-            # Use the proper register function
-            self.factory.register(op_name, operation)
+            self.factory.register_lazy(op_name, op_config.import_path, op_config.entry_point)
     
     def calculate(self, operation: str, a: float, b: float) -> float:
         """Calculate the result of an operation."""
         try:
+            if self.cache is not None:
+                output_format = self.config.output_format
+                # Operand types are part of the key: 1, 1.0 and True compare equal but give different results
+                key = (operation, a, b, type(a), type(b), output_format.decimal_places, output_format.format_output)
+                result = self.cache.get(key)
+                if result is MISSING:
+                    result = self.factory.create_operation(operation).execute(a, b)
+                    self.cache.put(key, result)
+                return result
             operation_obj = self.factory.create_operation(operation)
             return operation_obj.execute(a, b)
         except Exception as e:
             logger.error(f"Error in calculation: {e}")
             raise
     
+    def _calculate_instrumented(self, operation: str, a: float, b: float) -> float:
+        """Calculate, recording the call, its latency and its error type in the metrics."""
+        start = perf_counter()
+        try:
+            result = Calculator.calculate(self, operation, a, b)
+        except Exception as e:
+            self.metrics.record(operation, perf_counter() - start, self._error_type(e))
+            raise
+        self.metrics.record(operation, perf_counter() - start)
+        return result
+    
+    def _error_type(self, error: Exception) -> str:
+        """Classify an error by the configured message it carries."""
+        message = str(error)
+        if message.startswith(self.config.errors.division_by_zero):
+            return "division_by_zero"
+        if message.startswith(self.config.errors.unknown_operation):
+            return "unknown_operation"
+        return type(error).__name__
+    
+    def enable_metrics(self) -> None:
+        """Start recording metrics for calculate()."""
+        if self.metrics is None:
+            self.metrics = Metrics()
+        # Shadow the method on the instance, so the disabled path has no checks at all
+        self.calculate = self._calculate_instrumented
+    
+    def disable_metrics(self) -> None:
+        """Stop recording metrics; recorded stats are kept until reset_stats()."""
+        self.__dict__.pop("calculate", None)
+    
+    def stats(self) -> dict[str, OperationStats]:
+        """Get a snapshot of per-operation call counts, error counts and latency histograms."""
+        return self.metrics.snapshot() if self.metrics is not None else {}
+    
+    def reset_stats(self) -> None:
+        """Clear all recorded metrics."""
+        if self.metrics is not None:
+            self.metrics.reset()
+    
+    def calculate_batch(self, operation: str, a_array: np.ndarray | array, b_array: np.ndarray | array) -> np.ndarray:
+        """Calculate the result of an operation element-wise over two arrays."""
+        try:
+            operation_obj = self.factory.create_operation(operation)
+            a, b = np.broadcast_arrays(
+                np.asarray(a_array, dtype=np.float64),
+                np.asarray(b_array, dtype=np.float64)
+            )
+            return operation_obj.execute_batch(a, b)
+        except Exception as e:
+            logger.error(f"Error in batch calculation: {e}")
+            raise
+    
+    def reduce(self, operation: str, iterable: Iterable[float], chunk_size: int = 65536) -> float:
+        """Fold a stream of numbers with one operation, consuming it lazily in chunks and rounding once at the end."""
+        try:
+            operation_obj = self.factory.create_operation(operation)
+            return operation_obj.format_result(operation_obj.reduce_chunks(self._chunks(iterable, chunk_size)))
+        except Exception as e:
+            logger.error(f"Error in reduction: {e}")
+            raise
+    
+    @staticmethod
+    def _chunks(iterable: Iterable[float], chunk_size: int) -> Iterator[np.ndarray]:
+        """Yield float64 chunks of an iterable; arrays and buffers are sliced without copying."""
+        if isinstance(iterable, (np.ndarray, array)):
+            values = np.asarray(iterable, dtype=np.float64).ravel()
+            for start in range(0, len(values), chunk_size):
+                yield values[start:start + chunk_size]
+            return
+        iterator = iter(iterable)
+        while True:
+            chunk = np.fromiter(islice(iterator, chunk_size), dtype=np.float64)
+            if not len(chunk):
+                return
+            yield chunk
+    
+    def calculate_parallel(self, operation: str, a_array: np.ndarray | array, b_array: np.ndarray | array,
+                           workers: int | None = None, chunk_size: int | None = None) -> np.ndarray:
+        """Calculate the result of an operation element-wise across a pool of worker processes."""
+        try:
+            self.factory.create_operation(operation)
+            a, b = np.broadcast_arrays(
+                np.asarray(a_array, dtype=np.float64).ravel(),
+                np.asarray(b_array, dtype=np.float64).ravel()
+            )
+            if self._runner is None or (workers and self._runner.workers != workers):
+                # Imported here: multiprocessing and shared memory are only needed by parallel runs
+                from parallel_runner import ParallelRunner
+                self.close()
+                self._runner = ParallelRunner(self.config_path, workers)
+            return self._runner.calculate(operation, a, b, chunk_size)
+        except Exception as e:
+            logger.error(f"Error in parallel calculation: {e}")
+            raise
+    
+    def close(self) -> None:
+        """Shut down the worker pool used by calculate_parallel, if any."""
+        if self._runner is not None:
+            self._runner.close()
+            self._runner = None
+    
+    def evaluate(self, expression: str) -> float:
+        """Evaluate an infix expression, reusing the compiled program for repeated expressions."""
+        try:
+            compiled = self._compile(expression)
+            if compiled.variables:
+                raise ValueError(f"{self.config.errors.invalid_expression}: {expression}")
+            return compiled.execute(self.factory)
+        except Exception as e:
+            logger.error(f"Error in evaluation: {e}")
+            raise
+    
+    def evaluate_columns(self, expression: str, columns: dict[str, np.ndarray | array], chunk_size: int | None = None) -> np.ndarray:
+        """Evaluate an expression over named columns in cache-sized chunks."""
+        try:
+            compiled = self._compile(expression)
+            arrays = {name: np.asarray(column, dtype=np.float64) for name, column in columns.items()}
+            unbound = [name for name in compiled.variables if name not in arrays]
+            if unbound:
+                raise ValueError(f"{self.config.errors.invalid_expression}: unbound variables {unbound}")
+            arrays = {name: arrays[name] for name in compiled.variables}
+            if any(column.ndim != 1 for column in arrays.values()) or len({len(column) for column in arrays.values()}) > 1:
+                raise ValueError("Columns must be one-dimensional and of equal length")
+            return compiled.execute_columns(self.factory, arrays, chunk_size or self.config.expression.chunk_size)
+        except Exception as e:
+            logger.error(f"Error in column evaluation: {e}")
+            raise
+    
+    def cache_stats(self) -> CacheStats | None:
+        """Get hit, miss and eviction counters of the result cache, if enabled."""
+        return self.cache.stats() if self.cache is not None else None
+    
+    def clear_cache(self) -> None:
+        """Drop all memoized results."""
+        if self.cache is not None:
+            self.cache.clear()
+    
     def get_supported_operations(self) -> list[str]:
         """Get list of supported operations."""
         return self.factory.get_supported_operations()
@@ -1,13 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, is_dataclass
 from typing import Optional
+import hashlib
+import pickle
 import yaml
 import os
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Use the C-accelerated LibYAML loader when PyYAML was built with it
+_SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
 
 @dataclass
 class OperationConfig:
     """Configuration for a single operation."""
     symbol: str
     description: str
+    precedence: int
+    import_path: Optional[str]
+    entry_point: Optional[str]
 
 @dataclass
 class ErrorMessages:
@@ -23,6 +35,29 @@ class OutputFormat:
     decimal_places: int
     format_output: bool
 
+@dataclass
+class BatchConfig:
+    """Batch calculation configuration."""
+    error_policy: str
+
+@dataclass
+class ExpressionConfig:
+    """Expression evaluation configuration."""
+    cache_size: int
+    chunk_size: int
+
+@dataclass
+class CacheConfig:
+    """Result cache configuration."""
+    enabled: bool
+    max_size: int
+    eviction_policy: str
+
+@dataclass
+class MetricsConfig:
+    """Instrumentation configuration."""
+    enabled: bool
+
 @dataclass
 class CalculatorConfig:
     """
@@ -32,6 +67,20 @@ class CalculatorConfig:
     operations: dict[str, OperationConfig]
     errors: ErrorMessages
     output_format: OutputFormat
+    batch: BatchConfig
+    expression: ExpressionConfig
+    cache: CacheConfig
+    metrics: MetricsConfig
+
+BATCH_ERROR_POLICIES = ("raise", "nan", "mask")
+
+# Built-in operations, used when an operation does not set "class" or "entry_point"
+DEFAULT_IMPORT_PATHS = {
+    "add": "add:Add",
+    "subtract": "substract:Substract",
+    "multiply": "mul:Multiply",
+    "divide": "divide:Divide",
+}
 
 class CalculatorConfigBuilder:
     """
@@ -49,9 +98,14 @@ class CalculatorConfigBuilder:
             # Build operations config
             operations = {}
             for op_name, op_data in calculator_config["operations"].items():
+                entry_point = op_data.get("entry_point")
+                import_path = op_data.get("class") or (None if entry_point else DEFAULT_IMPORT_PATHS.get(op_name))
                 operations[op_name] = OperationConfig(
                     symbol=op_data["symbol"],
-                    description=op_data["description"]
+                    description=op_data["description"],
+                    precedence=op_data.get("precedence", 1),
+                    import_path=import_path,
+                    entry_point=entry_point
                 )
             
             # Build errors config
@@ -68,11 +122,44 @@ class CalculatorConfigBuilder:
                 format_output=calculator_config["output_format"]["format_output"]
             )
             
+            # Build batch config (optional section)
+            batch_data = calculator_config.get("batch") or {}
+            batch = BatchConfig(
+                error_policy=batch_data.get("error_policy", "nan")
+            )
+            if batch.error_policy not in BATCH_ERROR_POLICIES:
+                raise ValueError(f"Unknown batch error policy: {batch.error_policy}")
+            
+            # Build expression config (optional section)
+            expression_data = calculator_config.get("expression") or {}
+            expression = ExpressionConfig(
+                cache_size=expression_data.get("cache_size", 256),
+                chunk_size=expression_data.get("chunk_size", 16384)
+            )
+            
+            # Build result cache config (optional section)
+            cache_data = calculator_config.get("cache") or {}
+            cache = CacheConfig(
+                enabled=cache_data.get("enabled", False),
+                max_size=cache_data.get("max_size", 1024),
+                eviction_policy=cache_data.get("eviction_policy", "lru")
+            )
+            
+            # Build metrics config (optional section)
+            metrics_data = calculator_config.get("metrics") or {}
+            metrics = MetricsConfig(
+                enabled=metrics_data.get("enabled", False)
+            )
+            
             self.calculator_config = CalculatorConfig(
                 name=calculator_config["name"],
                 operations=operations,
                 errors=errors,
-                output_format=output_format
+                output_format=output_format,
+                batch=batch,
+                expression=expression,
+                cache=cache,
+                metrics=metrics
             )
         return self
     
@@ -99,9 +186,87 @@ def load_config_from_yaml(yaml_file_path: str) -> dict:
         raise FileNotFoundError(f"Configuration file not found: {yaml_file_path}")
     
     try:
-        with open(yaml_file_path, 'r') as file:
-            return yaml.safe_load(file)
+        with open(yaml_file_path, 'rb') as file:
+            return _parse_yaml(file.read())
+    except ValueError:
+        raise
+    except Exception as e:
+        raise ValueError(f"Error reading configuration file: {e}")
+
+def _parse_yaml(content: bytes) -> dict:
+    """
+    Parses YAML content with the fastest available safe loader.
+    """
+    try:
+        return yaml.load(content, Loader=_SafeLoader)
     except yaml.YAMLError as e:
         raise ValueError(f"Error parsing YAML file: {e}")
-    except Exception as e:
-        raise ValueError(f"Error reading configuration file: {e}")
\ No newline at end of file
+
+def _schema_fingerprint(cls: type) -> tuple:
+    """
+    Describes a config dataclass, so snapshots pickled by an older layout
+    of these classes are rebuilt instead of loaded.
+    """
+    return (cls.__name__,) + tuple(
+        (field.name, _schema_fingerprint(field.type) if is_dataclass(field.type) else str(field.type))
+        for field in fields(cls)
+    )
+
+_SNAPSHOT_SCHEMA = (_schema_fingerprint(CalculatorConfig), _schema_fingerprint(OperationConfig))
+
+def snapshot_path_for(yaml_file_path: str) -> str:
+    """
+    Returns where the compiled snapshot of a YAML config is stored.
+    """
+    directory, filename = os.path.split(os.path.abspath(yaml_file_path))
+    return os.path.join(directory, "__pycache__", f"{filename}.snapshot.pickle")
+
+def load_calculator_config_snapshot(yaml_file_path: str) -> CalculatorConfig:
+    """
+    Loads the calculator config from a compiled snapshot of the YAML file.
+    The snapshot is keyed by the file's path, mtime and content hash, and
+    is rebuilt from the YAML whenever it is stale.
+    """
+    if not os.path.exists(yaml_file_path):
+        raise FileNotFoundError(f"Configuration file not found: {yaml_file_path}")
+    
+    path = os.path.abspath(yaml_file_path)
+    stat = os.stat(path)
+    schema = _SNAPSHOT_SCHEMA
+    snapshot_path = snapshot_path_for(path)
+    snapshot = None
+    try:
+        with open(snapshot_path, 'rb') as file:
+            snapshot = pickle.load(file)
+        if snapshot["schema"] != schema or snapshot["path"] != path:
+            snapshot = None
+        elif snapshot["mtime_ns"] == stat.st_mtime_ns and snapshot["size"] == stat.st_size:
+            return snapshot["config"]
+    except Exception:
+        snapshot = None
+    
+    with open(path, 'rb') as file:
+        content = file.read()
+    digest = hashlib.sha256(content).hexdigest()
+    if snapshot is not None and snapshot["sha256"] == digest:
+        # Touched but unchanged: keep the compiled config, refresh the key
+        config = snapshot["config"]
+    else:
+        config = load_calculator_config(_parse_yaml(content))
+    
+    try:
+        os.makedirs(os.path.dirname(snapshot_path), exist_ok=True)
+        temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as file:
+            pickle.dump({
+                "schema": schema,
+                "path": path,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "config": config
+            }, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, snapshot_path)
+    except OSError as e:
+        logger.warning(f"Could not write config snapshot {snapshot_path}: {e}")
+    return config
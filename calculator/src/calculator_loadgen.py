@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Load generator for calculator_server.py.
+Opens several connections, pipelines requests on each and reports
+p50/p99 latency and requests per second.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+OPERATIONS = ("add", "subtract", "multiply", "divide")
+
+async def _run_connection(args, latencies: list[float]) -> None:
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    sent_at: dict[int, float] = {}
+    in_flight = asyncio.Semaphore(args.pipeline)
+
+    async def read_responses():
+        for _ in range(args.requests):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent_at.pop(response["id"]))
+            in_flight.release()
+
+    receiver = asyncio.create_task(read_responses())
+    for request_id in range(args.requests):
+        await in_flight.acquire()
+        request = {
+            "id": request_id,
+            "operation": random.choice(OPERATIONS),
+            "a": random.uniform(-100.0, 100.0),
+            "b": random.uniform(1.0, 100.0),
+        }
+        sent_at[request_id] = time.perf_counter()
+        writer.write((json.dumps(request) + "\n").encode())
+        if request_id % args.pipeline == 0:
+            await writer.drain()
+    await writer.drain()
+    await receiver
+    writer.close()
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return sorted_values[index]
+
+async def run(args) -> dict:
+    """
+    Runs the load and returns a summary of latency and throughput.
+    """
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(*(_run_connection(args, latencies) for _ in range(args.connections)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50_ms": _percentile(latencies, 50) * 1000,
+        "p99_ms": _percentile(latencies, 99) * 1000,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate load against the calculator server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Connect to this Unix socket path instead of TCP")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=10000, help="Requests per connection")
+    parser.add_argument("--pipeline", type=int, default=64, help="Requests in flight per connection")
+    args = parser.parse_args()
+
+    summary = asyncio.run(run(args))
+    print(f"{summary['requests']} requests in {summary['seconds']:.2f}s: "
+          f"{summary['rps']:.0f} req/s, p50 {summary['p50_ms']:.2f} ms, p99 {summary['p99_ms']:.2f} ms")
+
+if __name__ == "__main__":
+    main()
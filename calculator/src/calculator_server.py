@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Micro-batching asyncio service in front of Calculator.
+
+Speaks line-delimited JSON over TCP or a Unix socket. Each request line is
+{"id": ..., "operation": "add", "a": 1, "b": 2} and is answered with
+{"id": ..., "result": 3.0} or {"id": ..., "error": "..."}. Requests may be
+pipelined on one connection; responses carry the request id and can arrive
+out of order. Requests arriving within a short window are coalesced into one
+calculate_batch call per operation.
+"""
+
+from dataclasses import dataclass
+from calculator import Calculator
+from batch_pipeline import calculate_group
+import numpy as np
+import argparse
+import asyncio
+import json
+import logging
+import os
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BatcherStats:
+    """Counters for the micro-batcher."""
+    requests: int = 0
+    batches: int = 0
+
+class MicroBatcher:
+    """
+    Coalesces calculations submitted within a time window into batches.
+    A batch is flushed when the window elapses or max_batch is reached.
+    """
+    def __init__(self, calculator: Calculator, window: float = 0.001, max_batch: int = 4096):
+        self.calculator = calculator
+        self.window = window
+        self.max_batch = max_batch
+        self.stats = BatcherStats()
+        self._pending: list[tuple[str, float, float, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+
+    def submit(self, operation: str, a: float, b: float) -> asyncio.Future:
+        """
+        Queues a calculation and returns a future for its result.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((operation, a, b, future))
+        self.stats.requests += 1
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.window, self.flush)
+        return future
+
+    def flush(self) -> None:
+        """
+        Calculates every pending request, one batch per operation.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        self.stats.batches += 1
+
+        groups: dict[str, list[tuple[float, float, asyncio.Future]]] = {}
+        supported = set(self.calculator.get_supported_operations())
+        for operation, a, b, future in pending:
+            if future.done():
+                # Cancelled when its client disconnected
+                continue
+            if operation not in supported:
+                future.set_exception(ValueError(f"{self.calculator.config.errors.unknown_operation}: {operation}"))
+            else:
+                groups.setdefault(operation, []).append((a, b, future))
+
+        for operation, items in groups.items():
+            try:
+                a = np.fromiter((item[0] for item in items), dtype=np.float64, count=len(items))
+                b = np.fromiter((item[1] for item in items), dtype=np.float64, count=len(items))
+                values, failures = calculate_group(self.calculator, operation, a, b)
+            except Exception as e:
+                logger.error(f"Batch of {operation} failed: {e}")
+                for _, _, future in items:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for index, (_, _, future) in enumerate(items):
+                if future.done():
+                    continue
+                if index in failures:
+                    future.set_exception(ValueError(failures[index]))
+                else:
+                    future.set_result(float(values[index]))
+
+class CalculatorServer:
+    """
+    Line-delimited JSON server that feeds every request through a MicroBatcher.
+    """
+    def __init__(self, calculator: Calculator, window: float = 0.001, max_batch: int = 4096):
+        self.calculator = calculator
+        self.batcher = MicroBatcher(calculator, window, max_batch)
+
+    async def _respond(self, writer: asyncio.StreamWriter, request_id, future: asyncio.Future) -> None:
+        try:
+            response = {"id": request_id, "result": await future}
+        except Exception as e:
+            response = {"id": request_id, "error": str(e)}
+        if not writer.is_closing():
+            writer.write((json.dumps(response) + "\n").encode())
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """
+        Serves one connection. Each line is submitted as soon as it is read,
+        so pipelined requests share batches with other connections.
+        """
+        tasks = set()
+        try:
+            while line := await reader.readline():
+                request_id = None
+                try:
+                    request = json.loads(line)
+                    request_id = request.get("id")
+                    future = self.batcher.submit(request["operation"], float(request["a"]), float(request["b"]))
+                except (ValueError, KeyError, TypeError, AttributeError):
+                    future = asyncio.get_running_loop().create_future()
+                    future.set_exception(ValueError(self.calculator.config.errors.invalid_expression))
+                task = asyncio.create_task(self._respond(writer, request_id, future))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                if writer.transport.get_write_buffer_size() > 1 << 20:
+                    await writer.drain()
+            if tasks:
+                await asyncio.gather(*tasks)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8765, unix_path: str | None = None) -> asyncio.base_events.Server:
+        """
+        Starts listening on a Unix socket if unix_path is given, else on TCP.
+        """
+        if unix_path is not None:
+            return await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+async def serve(calculator: Calculator, host: str, port: int, unix_path: str | None, window: float, max_batch: int) -> None:
+    server = await CalculatorServer(calculator, window, max_batch).start(host, port, unix_path)
+    logger.info(f"Calculator server listening on {unix_path or f'{host}:{port}'}")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the calculator over line-delimited JSON.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on this Unix socket path instead of TCP")
+    parser.add_argument("--window-ms", type=float, default=1.0, help="Batching window in milliseconds")
+    parser.add_argument("--max-batch", type=int, default=4096, help="Flush a batch early at this size")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "calculator.yaml"))
+    args = parser.parse_args()
+
+    calculator = Calculator(args.config)
+    try:
+        asyncio.run(serve(calculator, args.host, args.port, args.unix, args.window_ms / 1000, args.max_batch))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 from operations import Operations
+import numpy as np
 import logging
 from calculator_config import CalculatorConfig
+from typing import Iterable
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,6 +27,64 @@ class Divide(Operations):
         Returns:
             float: The formatted result of the operation.
         """
+        return self.format_result(self.compute(a, b))
+
+    def execute_batch(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Executes the operation element-wise over two arrays.
+        Zero divisors are handled according to the configured batch
+        error policy instead of failing on the first bad element.
+        Args:
+            a (np.ndarray): The first numbers.
+            b (np.ndarray): The second numbers.
+
+        Returns:
+            np.ndarray: The formatted results of the operation. A masked
+            array when the error policy is "mask".
+        """
+        return self.format_batch(self.compute_batch(a, b))
+
+    def compute(self, a: float, b: float) -> float:
+        """
+        Executes the operation without formatting the result.
+        """
         if b == 0:
             raise ValueError(self.config.errors.division_by_zero)
-        return self.format_result(a / b)
\ No newline at end of file
+        return a / b
+
+    def compute_batch(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Executes the operation element-wise without formatting the results,
+        applying the batch error policy to zero divisors.
+        """
+        zero = b == 0
+        has_zero = bool(zero.any())
+        policy = self.config.batch.error_policy
+        if has_zero and policy == "raise":
+            raise ValueError(self.config.errors.division_by_zero)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            result = a / b
+        if policy == "mask":
+            return np.ma.masked_array(result, mask=zero)
+        if has_zero:
+            # Not item assignment: with 0-d inputs the result is a numpy scalar
+            result = np.where(zero, np.nan, result)
+        return result
+
+    def reduce_chunks(self, chunks: Iterable[np.ndarray]) -> float:
+        """
+        Folds the values left to right, dividing by one value at a time,
+        as chained execute() calls do.
+        Args:
+            chunks (Iterable[np.ndarray]): The values, in chunks.
+
+        Returns:
+            float: The unformatted result of the reduction.
+        """
+        result, rest = self.split_first(chunks)
+        for chunk in rest:
+            if not chunk.all():
+                raise ValueError(self.config.errors.division_by_zero)
+            with np.errstate(over="ignore", under="ignore"):
+                result = float(np.divide.reduce(np.concatenate(([result], chunk))))
+        return result
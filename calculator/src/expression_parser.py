@@ -0,0 +1,199 @@
+from dataclasses import dataclass
+from calculator_config import CalculatorConfig
+from operation_factory import OperationFactory
+import numpy as np
+import re
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Unary minus in a program; an object, so no operation name can collide with it
+_NEGATE = object()
+_NUMBER = r"(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?"
+_NAME = r"[A-Za-z_]\w*"
+
+@dataclass(frozen=True)
+class Variable:
+    """A named operand bound to a column at evaluation time."""
+    name: str
+
+@dataclass(frozen=True)
+class CompiledExpression:
+    """
+    A parsed expression as a flat postfix program.
+    Operands are floats or variables, operators are operation names.
+    """
+    expression: str
+    program: tuple
+    variables: tuple
+
+    def execute(self, factory: OperationFactory) -> float:
+        """
+        Runs the program against the operations registered in the factory.
+        Intermediate results are not formatted; the last operation formats
+        the final value once.
+
+        Args:
+            factory (OperationFactory): The factory to resolve operations from.
+
+        Returns:
+            float: The result of the expression.
+        """
+        stack = []
+        operation = None
+        for step in self.program:
+            if step.__class__ is float:
+                stack.append(step)
+            elif step is _NEGATE:
+                stack.append(-stack.pop())
+            else:
+                b = stack.pop()
+                a = stack.pop()
+                operation = factory.create_operation(step)
+                stack.append(operation.compute(a, b))
+        if operation is None:
+            return stack[0]
+        return operation.format_result(stack[0])
+
+    def execute_columns(self, factory: OperationFactory, columns: dict[str, np.ndarray], chunk_size: int) -> np.ndarray:
+        """
+        Runs the program over equal-length columns, one chunk at a time, so
+        intermediate results stay chunk-sized instead of column-sized.
+        Intermediate results are not formatted; the last operation formats
+        each chunk's final values once.
+
+        Args:
+            factory (OperationFactory): The factory to resolve operations from.
+            columns (dict[str, np.ndarray]): The arrays bound to each variable.
+            chunk_size (int): The number of rows evaluated per chunk.
+
+        Returns:
+            np.ndarray: The result for every row. A masked array when any
+            operation produced masked results.
+        """
+        length = len(next(iter(columns.values()))) if columns else 1
+        out = np.empty(length, dtype=np.float64)
+        mask = None
+        for start in range(0, length, chunk_size):
+            stop = min(start + chunk_size, length)
+            constants = {}
+            stack = []
+            operation = None
+            for step in self.program:
+                if step.__class__ is float:
+                    if step not in constants:
+                        constants[step] = np.full(stop - start, step)
+                    stack.append(constants[step])
+                elif step.__class__ is Variable:
+                    stack.append(columns[step.name][start:stop])
+                elif step is _NEGATE:
+                    stack.append(-stack.pop())
+                else:
+                    b = stack.pop()
+                    a = stack.pop()
+                    operation = factory.create_operation(step)
+                    stack.append(operation.compute_batch(a, b))
+            result = stack[0] if operation is None else operation.format_batch(stack[0])
+            if isinstance(result, np.ma.MaskedArray):
+                if mask is None:
+                    mask = np.zeros(length, dtype=bool)
+                mask[start:stop] = np.ma.getmaskarray(result)
+                result = result.data
+            out[start:stop] = result
+        if mask is not None:
+            return np.ma.masked_array(out, mask=mask)
+        return out
+
+class ExpressionParser:
+    """
+    Parses infix expressions into postfix programs using the operation
+    symbols and precedences from the calculator config.
+    """
+    def __init__(self, config: CalculatorConfig):
+        self.config = config
+        self._operators = {op.symbol: name for name, op in config.operations.items()}
+        self._precedence = {name: op.precedence for name, op in config.operations.items()}
+        self._negate_symbol = config.operations["subtract"].symbol if "subtract" in config.operations else None
+        symbols = sorted(self._operators, key=len, reverse=True)
+        self._token_pattern = re.compile(
+            r"\s*(?:(?P<number>" + _NUMBER + r")|(?P<paren>[()])|(?P<operator>"
+            + "|".join(re.escape(symbol) for symbol in symbols) + r")|(?P<name>" + _NAME + r"))"
+        )
+
+    def tokenize(self, expression: str) -> list[tuple[str, str]]:
+        """
+        Splits an expression into (kind, text) tokens.
+        """
+        tokens = []
+        position = 0
+        end = len(expression.rstrip())
+        while position < end:
+            match = self._token_pattern.match(expression, position)
+            if not match:
+                raise ValueError(f"{self.config.errors.invalid_expression}: {expression}")
+            tokens.append((match.lastgroup, match.group(match.lastgroup)))
+            position = match.end()
+        return tokens
+
+    def compile(self, expression: str) -> CompiledExpression:
+        """
+        Compiles an infix expression into a postfix program (shunting-yard).
+
+        Args:
+            expression (str): The infix expression, e.g. "3 * (4 + 2) / 7".
+
+        Returns:
+            CompiledExpression: The compiled program.
+        """
+        output = []
+        stack = []
+        variables = []
+        expect_operand = True
+        for kind, text in self.tokenize(expression):
+            if kind == "number":
+                if not expect_operand:
+                    raise ValueError(f"{self.config.errors.invalid_expression}: {expression}")
+                output.append(float(text))
+                expect_operand = False
+            elif kind == "name":
+                if not expect_operand:
+                    raise ValueError(f"{self.config.errors.invalid_expression}: {expression}")
+                output.append(Variable(text))
+                if text not in variables:
+                    variables.append(text)
+                expect_operand = False
+            elif text == "(":
+                if not expect_operand:
+                    raise ValueError(f"{self.config.errors.invalid_expression}: {expression}")
+                stack.append(text)
+            elif text == ")":
+                if expect_operand:
+                    raise ValueError(f"{self.config.errors.invalid_expression}: {expression}")
+                while stack and stack[-1] != "(":
+                    output.append(stack.pop())
+                if not stack:
+                    raise ValueError(f"{self.config.errors.unmatched_parentheses}: {expression}")
+                stack.pop()
+            elif expect_operand:
+                # Only the subtraction symbol is allowed in operand position, as unary minus
+                if text != self._negate_symbol:
+                    raise ValueError(f"{self.config.errors.invalid_expression}: {expression}")
+                stack.append(_NEGATE)
+            else:
+                operation = self._operators[text]
+                precedence = self._precedence[operation]
+                while stack and stack[-1] != "(" and (
+                    stack[-1] is _NEGATE or self._precedence[stack[-1]] >= precedence
+                ):
+                    output.append(stack.pop())
+                stack.append(operation)
+                expect_operand = True
+        if expect_operand:
+            raise ValueError(f"{self.config.errors.invalid_expression}: {expression}")
+        while stack:
+            token = stack.pop()
+            if token == "(":
+                raise ValueError(f"{self.config.errors.unmatched_parentheses}: {expression}")
+            output.append(token)
+        return CompiledExpression(expression=expression, program=tuple(output), variables=tuple(variables))
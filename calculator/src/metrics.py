@@ -0,0 +1,67 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds of the latency buckets: 100ns doubling up to ~0.84s.
+# The last bucket counts everything slower.
+LATENCY_BUCKETS = tuple(1e-7 * 2 ** i for i in range(24))
+
+@dataclass
+class OperationStats:
+    """Counters and latency histogram for a single operation."""
+    calls: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the upper bound of the bucket holding the given percentile,
+        or inf when it falls in the overflow bucket.
+        """
+        total = sum(self.latency_buckets)
+        if total == 0:
+            return 0.0
+        threshold = total * percent / 100
+        seen = 0
+        for index, count in enumerate(self.latency_buckets):
+            seen += count
+            if seen >= threshold:
+                return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float("inf")
+        return float("inf")
+
+class Metrics:
+    """
+    Per-operation call counts, error counts by type and latency histograms.
+    """
+    def __init__(self):
+        self._operations: dict[str, OperationStats] = {}
+
+    def record(self, operation: str, seconds: float, error_type: str | None = None) -> None:
+        """
+        Records one call and its latency, and the error type if it failed.
+        """
+        stats = self._operations.get(operation)
+        if stats is None:
+            stats = self._operations[operation] = OperationStats()
+        stats.calls += 1
+        stats.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        if error_type is not None:
+            stats.errors[error_type] = stats.errors.get(error_type, 0) + 1
+
+    def snapshot(self) -> dict[str, OperationStats]:
+        """
+        Returns a copy of the counters of every operation.
+        """
+        return {
+            name: OperationStats(stats.calls, dict(stats.errors), list(stats.latency_buckets))
+            for name, stats in self._operations.items()
+        }
+
+    def reset(self) -> None:
+        """
+        Clears every counter.
+        """
+        self._operations = {}
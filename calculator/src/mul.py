@@ -1,6 +1,8 @@
 from operations import Operations
+import numpy as np
 import logging
 from calculator_config import CalculatorConfig
+from typing import Iterable
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,4 +27,43 @@ class Multiply(Operations):
         Returns:
             float: The formatted result of the operation.
         """
-        return self.format_result(a * b)
\ No newline at end of file
+        return self.format_result(self.compute(a, b))
+
+    def execute_batch(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Executes the operation element-wise over two arrays.
+        Args:
+            a (np.ndarray): The first numbers.
+            b (np.ndarray): The second numbers.
+
+        Returns:
+            np.ndarray: The formatted results of the operation.
+        """
+        return self.format_batch(self.compute_batch(a, b))
+
+    def compute(self, a: float, b: float) -> float:
+        """
+        Executes the operation without formatting the result.
+        """
+        return a * b
+
+    def compute_batch(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Executes the operation element-wise without formatting the results.
+        """
+        return a * b
+
+    def reduce_chunks(self, chunks: Iterable[np.ndarray]) -> float:
+        """
+        Folds the values into their product, one vectorized product per chunk.
+        Args:
+            chunks (Iterable[np.ndarray]): The values, in chunks.
+
+        Returns:
+            float: The unformatted result of the reduction.
+        """
+        result, rest = self.split_first(chunks)
+        with np.errstate(over="ignore", under="ignore", invalid="ignore"):
+            for chunk in rest:
+                result *= float(np.prod(chunk))
+        return result
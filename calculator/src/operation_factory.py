@@ -1,25 +1,110 @@
 from operations import Operations
 from calculator_config import CalculatorConfig
+from types import MappingProxyType
+from typing import Callable, Mapping, NamedTuple, Optional
+import importlib
 import logging
+import threading
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+ENTRY_POINT_GROUP = "calculator.operations"
+
+class Registry(NamedTuple):
+    """
+    Immutable snapshot of the registered operations. The factory swaps in a
+    new snapshot on every change, so readers never need a lock.
+    """
+    operations: Mapping[str, Operations]
+    lazy: Mapping[str, tuple[Optional[str], Optional[str]]]
+
 class OperationFactory:
     """
     Factory for creating operations.
+    Reads are lock-free; registrations copy the registry under a lock and
+    publish the new snapshot with a single attribute assignment.
     """
     def __init__(self, config: CalculatorConfig) -> None:
         self.config = config
-        self._operations: dict[str, Operations] = None
+        self._registry = Registry(MappingProxyType({}), MappingProxyType({}))
+        self._write_lock = threading.RLock()
+        self._listeners: tuple[Callable[[str], None], ...] = ()
+
+    def _publish(self, operations: dict[str, Operations], lazy: dict[str, tuple[Optional[str], Optional[str]]]) -> None:
+        """
+        Atomically replaces the registry snapshot. Callers hold the write lock.
+        """
+        self._registry = Registry(MappingProxyType(operations), MappingProxyType(lazy))
 
     def register(self, operation_type: str, op: Operations) -> None:
         """
         Registers an operation.
         """
-        if self._operations is None:
-            self._operations = {}
-        self._operations[operation_type] = op
+        with self._write_lock:
+            registry = self._registry
+            lazy = dict(registry.lazy)
+            lazy.pop(operation_type, None)
+            self._publish({**registry.operations, operation_type: op}, lazy)
+        for listener in self._listeners:
+            listener(operation_type)
+
+    def register_lazy(self, operation_type: str, import_path: Optional[str] = None,
+                      entry_point: Optional[str] = None) -> None:
+        """
+        Registers an operation by reference. Its module is imported and the
+        operation instantiated only the first time it is created.
+
+        Args:
+            operation_type (str): The type of operation.
+            import_path (Optional[str]): "module:Class" of the operation.
+            entry_point (Optional[str]): Name of an entry point in the
+                calculator.operations group, used when import_path is not set.
+        """
+        if import_path is None and entry_point is None:
+            raise ValueError(f"Operation {operation_type} needs an import path or entry point")
+        with self._write_lock:
+            registry = self._registry
+            operations = dict(registry.operations)
+            operations.pop(operation_type, None)
+            self._publish(operations, {**registry.lazy, operation_type: (import_path, entry_point)})
+        for listener in self._listeners:
+            listener(operation_type)
+
+    def _load(self, operation_type: str) -> Operations:
+        """
+        Imports and instantiates a lazily registered operation, once, and
+        publishes it in a new registry snapshot.
+        """
+        with self._write_lock:
+            registry = self._registry
+            # Another thread may have loaded it while we waited for the lock
+            if operation_type in registry.operations:
+                return registry.operations[operation_type]
+            import_path, entry_point = registry.lazy[operation_type]
+            try:
+                if import_path is not None:
+                    module_name, _, class_name = import_path.partition(":")
+                    operation_class = getattr(importlib.import_module(module_name), class_name)
+                else:
+                    # Imported here: scanning installed distributions is only paid for entry point operations
+                    from importlib.metadata import entry_points
+                    matches = entry_points(group=ENTRY_POINT_GROUP, name=entry_point)
+                    if not matches:
+                        raise LookupError(f"no entry point {entry_point} in group {ENTRY_POINT_GROUP}")
+                    operation_class = next(iter(matches)).load()
+            except Exception as e:
+                raise ValueError(f"Cannot load operation {operation_type} from {import_path or entry_point}: {e}")
+            operation = operation_class(self.config)
+            self._publish({**registry.operations, operation_type: operation}, dict(registry.lazy))
+            return operation
+
+    def add_register_listener(self, listener: Callable[[str], None]) -> None:
+        """
+        Adds a callback invoked with the operation type on every register.
+        """
+        with self._write_lock:
+            self._listeners = self._listeners + (listener,)
 
     def create_operation(self, operation_type: str) -> Operations:
         """
@@ -30,16 +115,21 @@ class OperationFactory:
         Returns:
             Operations: The created operation.
         """
-        if self._operations is None:
+        registry = self._registry
+        operation = registry.operations.get(operation_type)
+        if operation is not None:
+            return operation
+        if operation_type in registry.lazy:
+            return self._load(operation_type)
+        if not registry.operations and not registry.lazy:
             raise ValueError(f"No operations registered")
-        if operation_type not in self._operations:
-            raise ValueError(f"{self.config.errors.unknown_operation}: {operation_type}")
-        return self._operations[operation_type] 
+        raise ValueError(f"{self.config.errors.unknown_operation}: {operation_type}")
     
     def get_supported_operations(self) -> list[str]:
         """
         Returns the supported operations.
         """
-        if self._operations is None:
+        registry = self._registry
+        if not registry.operations and not registry.lazy:
             raise ValueError(f"No operations registered")
-        return list(self._operations.keys())
\ No newline at end of file
+        return list(dict.fromkeys([*registry.lazy, *registry.operations]))
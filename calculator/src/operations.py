@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
 from calculator_config import CalculatorConfig
+from typing import Iterable, Iterator
+import numpy as np
+import math
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -29,6 +32,113 @@ class Operations(ABC):
             float: The result of the operation.
         """
         pass
+
+    def execute_batch(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Executes the operation element-wise over two arrays.
+        Falls back to calling execute() per element; subclasses override
+        this with a vectorized implementation.
+
+        Args:
+            a (np.ndarray): The first operands.
+            b (np.ndarray): The second operands.
+
+        Returns:
+            np.ndarray: The formatted results of the operation.
+        """
+        results = [self.execute(x, y) for x, y in zip(a.tolist(), b.tolist())]
+        return np.asarray(results, dtype=np.float64)
+
+    def compute(self, a: float, b: float) -> float:
+        """
+        Executes the operation without formatting the result, for callers
+        that chain operations and format only the final value.
+        Falls back to execute(); subclasses override this with the raw
+        computation.
+
+        Args:
+            a (float): The first number.
+            b (float): The second number.
+
+        Returns:
+            float: The unformatted result of the operation.
+        """
+        return self.execute(a, b)
+
+    def compute_batch(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Executes the operation element-wise without formatting the results.
+        Falls back to execute_batch(); subclasses override this with the
+        raw computation.
+
+        Args:
+            a (np.ndarray): The first operands.
+            b (np.ndarray): The second operands.
+
+        Returns:
+            np.ndarray: The unformatted results of the operation.
+        """
+        return self.execute_batch(a, b)
+    
+    def reduce_chunks(self, chunks: Iterable[np.ndarray]) -> float:
+        """
+        Folds a stream of chunks left to right into a single value.
+        Falls back to calling execute() per element; subclasses override
+        this with a vectorized reduction that rounds nothing, so the caller
+        can format the result once.
+
+        Args:
+            chunks (Iterable[np.ndarray]): The values, in chunks.
+
+        Returns:
+            float: The reduced value.
+        """
+        first, rest = self.split_first(chunks)
+        result = first
+        for chunk in rest:
+            for value in chunk.tolist():
+                result = self.execute(result, value)
+        return result
+
+    @staticmethod
+    def split_first(chunks: Iterable[np.ndarray]) -> tuple[float, Iterator[np.ndarray]]:
+        """
+        Splits a stream of chunks into its first value and the remaining chunks.
+        """
+        iterator = iter(chunks)
+        for chunk in iterator:
+            if len(chunk):
+                def rest():
+                    yield chunk[1:]
+                    yield from iterator
+                return float(chunk[0]), rest()
+        raise ValueError("Cannot reduce an empty iterable")
+    
+    @staticmethod
+    def sum_chunks(start: float, chunks: Iterable[np.ndarray]) -> float:
+        """
+        Adds a stream of chunks to start with a compensated running sum:
+        each chunk is summed exactly with math.fsum, and the chunk sums are
+        accumulated with Neumaier compensation. Chunks that fsum rejects
+        (infinities, or a sum that overflows) are summed like np.sum, so inf
+        and nan come out as chained additions would produce them.
+        """
+        total = start
+        compensation = 0.0
+        for chunk in chunks:
+            try:
+                value = math.fsum(chunk)
+            except (OverflowError, ValueError):
+                with np.errstate(over="ignore", invalid="ignore"):
+                    value = float(np.sum(chunk))
+            result = total + value
+            if math.isfinite(result):
+                if abs(total) >= abs(value):
+                    compensation += (total - result) + value
+                else:
+                    compensation += (value - result) + total
+            total = result
+        return total + compensation if math.isfinite(total) else total
     
     def format_result(self, result: float) -> float:
         """
@@ -43,4 +153,19 @@ class Operations(ABC):
         if self.config.output_format.format_output:
             return round(result, self.config.output_format.decimal_places)
         else:
-            return result
\ No newline at end of file
+            return result
+
+    def format_batch(self, result: np.ndarray) -> np.ndarray:
+        """
+        Formats an array of results in a single vectorized pass.
+
+        Args:
+            result (np.ndarray): The results of the operation.
+
+        Returns:
+            np.ndarray: The formatted results.
+        """
+        if self.config.output_format.format_output:
+            return np.round(result, self.config.output_format.decimal_places)
+        else:
+            return result
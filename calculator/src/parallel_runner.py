@@ -0,0 +1,127 @@
+from concurrent.futures import ProcessPoolExecutor, wait
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+import logging
+import os
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Calculator built once per worker process by _init_worker
+_worker_calculator = None
+
+def _init_worker(config_path: str) -> None:
+    """
+    Builds the worker's Calculator from the YAML path, once per process.
+    """
+    global _worker_calculator
+    # Imported here: calculator imports this module for calculate_parallel
+    from calculator import Calculator
+    _worker_calculator = Calculator(config_path)
+
+def _calculate_into(blocks: list[SharedMemory], operation: str, length: int, start: int, stop: int) -> bool | Exception:
+    """
+    Calculates rows [start, stop) into the shared output buffers.
+    Errors are returned without their traceback so no view into the
+    shared buffers outlives this call.
+    """
+    a, b, out = (np.ndarray((length,), dtype=np.float64, buffer=block.buf) for block in blocks[:3])
+    mask = np.ndarray((length,), dtype=bool, buffer=blocks[3].buf)
+    try:
+        result = _worker_calculator.calculate_batch(operation, a[start:stop], b[start:stop])
+        out[start:stop] = np.ma.filled(result, np.nan)
+        mask[start:stop] = np.ma.getmaskarray(result)
+        return isinstance(result, np.ma.MaskedArray)
+    except Exception as e:
+        return e.with_traceback(None)
+
+def _run_chunk(operation: str, names: tuple[str, str, str, str], length: int, start: int, stop: int) -> bool:
+    """
+    Calculates rows [start, stop) reading and writing the shared buffers.
+
+    Returns:
+        bool: Whether the operation returned a masked array.
+    """
+    blocks = [SharedMemory(name=name) for name in names]
+    result = _calculate_into(blocks, operation, length, start, stop)
+    for block in blocks:
+        block.close()
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+class ParallelRunner:
+    """
+    Runs batch calculations across a pool of worker processes. Inputs and
+    outputs live in shared memory so they are never pickled.
+    """
+    def __init__(self, config_path: str, workers: int | None = None):
+        self.config_path = config_path
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_init_worker,
+            initargs=(config_path,)
+        )
+
+    def calculate(self, operation: str, a: np.ndarray, b: np.ndarray, chunk_size: int | None = None) -> np.ndarray:
+        """
+        Calculates an operation over two equal-length arrays in parallel.
+
+        Args:
+            operation (str): The operation name.
+            a (np.ndarray): The first operands.
+            b (np.ndarray): The second operands.
+            chunk_size (int | None): Rows per task, defaults to an even split across workers.
+
+        Returns:
+            np.ndarray: The results, as a masked array when the operation returns one.
+        """
+        length = len(a)
+        if length == 0:
+            return np.empty(0, dtype=np.float64)
+        chunk_size = chunk_size or -(-length // self.workers)
+        sizes = (length * 8, length * 8, length * 8, length)
+        blocks = [SharedMemory(create=True, size=size) for size in sizes]
+        try:
+            result = self._calculate_shared(blocks, operation, a, b, chunk_size)
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def _calculate_shared(self, blocks: list[SharedMemory], operation: str, a: np.ndarray, b: np.ndarray,
+                          chunk_size: int) -> np.ndarray | Exception:
+        """
+        Fills the input blocks, fans chunks out to the workers and copies the
+        output back. Errors are returned so the blocks can be closed first.
+        """
+        length = len(a)
+        shared_a, shared_b, shared_out = (
+            np.ndarray((length,), dtype=np.float64, buffer=block.buf) for block in blocks[:3]
+        )
+        shared_mask = np.ndarray((length,), dtype=bool, buffer=blocks[3].buf)
+        shared_a[:] = a
+        shared_b[:] = b
+        names = tuple(block.name for block in blocks)
+        futures = [
+            self._pool.submit(_run_chunk, operation, names, length, start, min(start + chunk_size, length))
+            for start in range(0, length, chunk_size)
+        ]
+        # Let every task finish before the blocks are unlinked, even on failure
+        wait(futures)
+        errors = [future.exception() for future in futures if future.exception() is not None]
+        if errors:
+            return errors[0].with_traceback(None)
+        if any(future.result() for future in futures):
+            return np.ma.masked_array(shared_out.copy(), mask=shared_mask.copy())
+        return shared_out.copy()
+
+    def close(self) -> None:
+        """
+        Shuts down the worker pool.
+        """
+        self._pool.shutdown()
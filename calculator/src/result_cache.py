@@ -0,0 +1,95 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+EVICTION_POLICIES = ("lru", "fifo")
+
+# Returned by ResultCache.get on a miss, since None could be a cached value
+MISSING = object()
+
+@dataclass
+class CacheStats:
+    """Result cache counters."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+class ResultCache:
+    """
+    Bounded cache of calculation results.
+    "lru" evicts the least recently used entry, "fifo" the oldest inserted.
+    Safe to share between threads without a lock: each step is a single
+    OrderedDict call, and a key evicted concurrently is simply skipped.
+    Counters may undercount under contention.
+    """
+    def __init__(self, max_size: int, eviction_policy: str = "lru"):
+        if eviction_policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy: {eviction_policy}")
+        self.max_size = max_size
+        self.eviction_policy = eviction_policy
+        self._entries: OrderedDict = OrderedDict()
+        self._touch = eviction_policy == "lru"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> object:
+        """
+        Returns the cached value for key, or MISSING.
+        """
+        value = self._entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            if self._touch:
+                try:
+                    self._entries.move_to_end(key)
+                except KeyError:
+                    pass
+        return value
+
+    def put(self, key: tuple, value: object) -> None:
+        """
+        Stores a value, evicting an entry when the cache is full.
+        """
+        if self.max_size <= 0:
+            return
+        if key not in self._entries and len(self._entries) >= self.max_size:
+            try:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            except KeyError:
+                pass
+        self._entries[key] = value
+
+    def clear(self) -> None:
+        """
+        Drops every cached entry. Counters are kept.
+        """
+        self._entries.clear()
+
+    def reset_stats(self) -> None:
+        """
+        Resets the hit, miss and eviction counters.
+        """
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def stats(self) -> CacheStats:
+        """
+        Returns a snapshot of the cache counters.
+        """
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._entries),
+            max_size=self.max_size
+        )
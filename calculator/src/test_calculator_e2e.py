@@ -5,8 +5,31 @@ Tests all 4 basic operations with real config loading and calculation.
 """
 
 import unittest
+import math
 import os
+import threading
+import asyncio
+import json
+import tempfile
+from array import array
+import numpy as np
 from calculator import Calculator
+from batch_pipeline import process_file
+from result_cache import ResultCache
+from calculator_server import CalculatorServer
+import bench_calculator
+from unittest.mock import patch
+import shutil
+import calculator_config
+from operations import Operations
+
+class Power(Operations):
+    """Extra operation loaded lazily by import path in the tests."""
+    def name(self) -> str:
+        return "Power"
+    
+    def execute(self, a: float, b: float) -> float:
+        return self.format_result(a ** b)
 
 class TestCalculatorE2E(unittest.TestCase):
     """End-to-end tests for the calculator."""
@@ -63,6 +86,361 @@ class TestCalculatorE2E(unittest.TestCase):
             result = self.calculator.calculate(op_name, a, b)
             self.assertAlmostEqual(result, expected, places=2)
             print(f"✓ {op_name.capitalize()}: {a} {op_name} {b} = {result}")
+    
+    def test_batch_operations_e2e(self):
+        """Test vectorized batch calculation matches the scalar path."""
+        a = np.array([2.5, 8.9, 4.2, 10.0])
+        b = np.array([3.7, 2.1, 3.0, 3.0])
+        for op_name in ["add", "subtract", "multiply", "divide"]:
+            result = self.calculator.calculate_batch(op_name, a, b)
+            expected = [self.calculator.calculate(op_name, x, y) for x, y in zip(a, b)]
+            np.testing.assert_allclose(result, expected)
+        print("✓ Batch: all operations match scalar results")
+    
+    def test_batch_accepts_array_buffers_e2e(self):
+        """Test batch calculation over array.array buffers."""
+        result = self.calculator.calculate_batch("divide", array("d", [10.0, 15.0]), array("d", [3.0, 3.0]))
+        np.testing.assert_array_equal(result, [3.33, 5.0])
+        print(f"✓ Batch buffers: {result}")
+    
+    def test_batch_division_by_zero_policies_e2e(self):
+        """Test division by zero handling in batch mode for each error policy."""
+        a = np.array([1.0, 2.0, 3.0])
+        b = np.array([1.0, 0.0, 2.0])
+        
+        result = self.calculator.calculate_batch("divide", a, b)
+        np.testing.assert_array_equal(np.isnan(result), [False, True, False])
+        # Scalars broadcast to 0-d arrays
+        self.assertTrue(np.isnan(self.calculator.calculate_batch("divide", 1.0, 0.0)))
+        self.assertEqual(self.calculator.calculate_batch("divide", 3.0, 2.0), 1.5)
+        
+        self.calculator.config.batch.error_policy = "mask"
+        result = self.calculator.calculate_batch("divide", a, b)
+        np.testing.assert_array_equal(result.mask, [False, True, False])
+        self.assertEqual(result[2], 1.5)
+        
+        self.calculator.config.batch.error_policy = "raise"
+        with self.assertRaisesRegex(ValueError, "Division by zero"):
+            self.calculator.calculate_batch("divide", a, b)
+        print("✓ Batch division by zero: nan, mask and raise policies")
+    
+    def test_evaluate_expression_e2e(self):
+        """Test infix expression evaluation with precedence and parentheses."""
+        self.assertEqual(self.calculator.evaluate("3 * (4 + 2) / 7"), 2.57)
+        self.assertEqual(self.calculator.evaluate("2 + 3 * 4"), 14.0)
+        self.assertEqual(self.calculator.evaluate("10 - 4 - 3"), 3.0)
+        self.assertEqual(self.calculator.evaluate("-2 * (1.5 + .5)"), -4.0)
+        self.assertEqual(self.calculator.evaluate("10 / 3 * 3"), 10.0)
+        print("✓ Evaluate: 3 * (4 + 2) / 7 = 2.57")
+    
+    def test_evaluate_uses_parse_cache_e2e(self):
+        """Test that repeated expressions skip parsing."""
+        for _ in range(3):
+            self.calculator.evaluate("1 + 2")
+        info = self.calculator._compile.cache_info()
+        self.assertEqual(info.misses, 1)
+        self.assertEqual(info.hits, 2)
+        print(f"✓ Parse cache: {info}")
+    
+    def test_evaluate_errors_e2e(self):
+        """Test configured error messages for malformed expressions."""
+        with self.assertRaisesRegex(ValueError, "Unmatched parentheses"):
+            self.calculator.evaluate("(1 + 2")
+        with self.assertRaisesRegex(ValueError, "Unmatched parentheses"):
+            self.calculator.evaluate("1 + 2)")
+        with self.assertRaisesRegex(ValueError, "Invalid expression"):
+            self.calculator.evaluate("1 + * 2")
+        with self.assertRaisesRegex(ValueError, "Invalid expression"):
+            self.calculator.evaluate("1 + x")
+        with self.assertRaisesRegex(ValueError, "Division by zero"):
+            self.calculator.evaluate("1 / (2 - 2)")
+        print("✓ Evaluate errors: configured messages raised")
+    
+    def test_evaluate_columns_e2e(self):
+        """Test column-wise evaluation across chunk boundaries."""
+        rng = np.random.default_rng(0)
+        columns = {name: rng.uniform(1.0, 10.0, 1000) for name in "abcd"}
+        result = self.calculator.evaluate_columns("(a + b) * c / d", columns, chunk_size=64)
+        
+        a, b, c, d = (columns[name] for name in "abcd")
+        expected = np.round((a + b) * c / d, 2)
+        np.testing.assert_array_equal(result, expected)
+        print(f"✓ Columns: (a + b) * c / d over {len(result)} rows")
+    
+    def test_evaluate_columns_errors_e2e(self):
+        """Test column evaluation with division by zero and unbound variables."""
+        result = self.calculator.evaluate_columns("a / b - 1", {"a": [1.0, 2.0], "b": [0.0, 2.0]})
+        np.testing.assert_array_equal(np.isnan(result), [True, False])
+        self.assertEqual(result[1], 0.0)
+        
+        with self.assertRaisesRegex(ValueError, "unbound variables"):
+            self.calculator.evaluate_columns("a + z", {"a": [1.0]})
+        with self.assertRaisesRegex(ValueError, "Invalid expression"):
+            self.calculator.evaluate("a + 1")
+        print("✓ Columns errors: nan on zero divisor, unbound variables rejected")
+    
+    def test_streaming_pipeline_e2e(self):
+        """Test streaming CSV rows to NDJSON with per-row errors on a side channel."""
+        with tempfile.TemporaryDirectory() as tmp:
+            input_path = os.path.join(tmp, "input.csv")
+            output_path = os.path.join(tmp, "output.ndjson")
+            errors_path = os.path.join(tmp, "errors.ndjson")
+            with open(input_path, "w") as f:
+                f.write("operation,a,b\nadd,1,2\ndivide,1,0\nmodulo,1,2\nmultiply,x,2\ndivide,10,3\n")
+            
+            stats = process_file(self.calculator, input_path, output_path, errors_path, chunk_size=2)
+            with open(output_path) as f:
+                results = [json.loads(line) for line in f]
+            with open(errors_path) as f:
+                errors = [json.loads(line) for line in f]
+        
+        self.assertEqual((stats.rows, stats.results, stats.errors), (5, 2, 3))
+        self.assertEqual([r["result"] for r in results], [3.0, 3.33])
+        self.assertEqual([e["line"] for e in errors], [3, 4, 5])
+        self.assertEqual(errors[0]["error"], "Error: Division by zero")
+        self.assertTrue(errors[1]["error"].startswith("Error: Unknown operation"))
+        print(f"✓ Pipeline: {stats}")
+    
+    def test_parallel_batch_e2e(self):
+        """Test parallel batch calculation across worker processes."""
+        a = np.arange(1000, dtype=np.float64)
+        b = np.arange(1000, dtype=np.float64) % 7
+        try:
+            result = self.calculator.calculate_parallel("divide", a, b, workers=2, chunk_size=128)
+        finally:
+            self.calculator.close()
+        expected = self.calculator.calculate_batch("divide", a, b)
+        np.testing.assert_array_equal(result, expected)
+        self.assertTrue(np.isnan(result[0]))
+        print("✓ Parallel: 1000 rows across 2 workers match calculate_batch")
+    
+    def test_result_cache_e2e(self):
+        """Test result memoization, output format and operand type keys, and invalidation."""
+        self.assertIsNone(self.calculator.cache)
+        self.calculator.cache = ResultCache(max_size=16)
+        self.calculator.calculate("divide", 10.0, 3.0)
+        self.calculator.calculate("divide", 10.0, 3.0)
+        stats = self.calculator.cache_stats()
+        self.assertEqual((stats.hits, stats.misses, stats.size), (1, 1, 1))
+        
+        # Output format settings are part of the key
+        self.calculator.config.output_format.decimal_places = 3
+        self.assertEqual(self.calculator.calculate("divide", 10.0, 3.0), 3.333)
+        self.calculator.config.output_format.decimal_places = 2
+        
+        # Equal operands of different types are cached separately
+        self.assertEqual(repr(self.calculator.calculate("add", 1, 2)), "3")
+        self.assertEqual(repr(self.calculator.calculate("add", 1.0, 2.0)), "3.0")
+        
+        # Re-registering an operation invalidates cached results
+        self.calculator.factory.register("divide", self.calculator.factory.create_operation("divide"))
+        self.assertEqual(self.calculator.cache_stats().size, 0)
+        print(f"✓ Result cache: {self.calculator.cache_stats()}")
+    
+    def test_result_cache_eviction_e2e(self):
+        """Test the cache size bound and eviction counter."""
+        self.calculator.cache = ResultCache(max_size=2, eviction_policy="lru")
+        for b in (1.0, 2.0, 1.0, 3.0, 1.0):
+            self.calculator.calculate("add", 1.0, b)
+        stats = self.calculator.cache_stats()
+        self.assertEqual((stats.hits, stats.misses, stats.evictions, stats.size), (2, 3, 1, 2))
+        print(f"✓ Cache eviction: {stats}")
+    
+    def test_config_snapshot_e2e(self):
+        """Test the compiled config snapshot is reused and rebuilt when stale."""
+        with tempfile.TemporaryDirectory() as tmp:
+            config_path = os.path.join(tmp, "calculator.yaml")
+            shutil.copy(self.config_path, config_path)
+            config = calculator_config.load_calculator_config_snapshot(config_path)
+            self.assertTrue(os.path.exists(calculator_config.snapshot_path_for(config_path)))
+            
+            # Fresh snapshot: the YAML is neither parsed nor built again
+            with patch("calculator_config.load_calculator_config", side_effect=AssertionError("rebuilt")):
+                self.assertEqual(calculator_config.load_calculator_config_snapshot(config_path), config)
+                # Touched but unchanged content still reuses the snapshot
+                os.utime(config_path, ns=(0, 0))
+                self.assertEqual(calculator_config.load_calculator_config_snapshot(config_path), config)
+            
+            with open(config_path) as f:
+                content = f.read().replace("decimal_places: 2", "decimal_places: 4")
+            with open(config_path, "w") as f:
+                f.write(content)
+            os.utime(config_path, ns=(10**9, 10**9))
+            self.assertEqual(Calculator(config_path).calculate("divide", 10.0, 3.0), 3.3333)
+        print("✓ Config snapshot: reused when fresh, rebuilt when stale")
+    
+    def test_lazy_operation_registration_e2e(self):
+        """Test operations are instantiated on first use and can be plugged in by import path."""
+        calculator = Calculator(self.config_path)
+        self.assertEqual(calculator.get_supported_operations(), ["add", "subtract", "multiply", "divide"])
+        self.assertEqual(len(calculator.factory._registry.operations), 0)
+        
+        calculator.calculate("add", 1.0, 2.0)
+        self.assertEqual(list(calculator.factory._registry.operations), ["add"])
+        
+        calculator.factory.register_lazy("power", "test_calculator_e2e:Power")
+        self.assertEqual(calculator.calculate("power", 2.0, 10.0), 1024.0)
+        
+        calculator.factory.register_lazy("broken", "no_such_module:Nothing")
+        with self.assertRaisesRegex(ValueError, "Cannot load operation broken"):
+            calculator.calculate("broken", 1.0, 1.0)
+        print("✓ Lazy registration: operations imported on first use")
+    
+    def test_micro_batching_server_e2e(self):
+        """Test pipelined requests over a Unix socket are answered from coalesced batches."""
+        requests = [
+            {"id": 1, "operation": "add", "a": 5, "b": 3},
+            {"id": 2, "operation": "divide", "a": 10, "b": 3},
+            {"id": 3, "operation": "divide", "a": 1, "b": 0},
+            {"id": 4, "operation": "modulo", "a": 1, "b": 2},
+            {"id": 5, "operation": "multiply", "a": "x", "b": 2},
+        ]
+        
+        async def exchange(socket_path):
+            server = CalculatorServer(self.calculator, window=0.01)
+            listener = await server.start(unix_path=socket_path)
+            async with listener:
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                writer.write("".join(json.dumps(r) + "\n" for r in requests).encode())
+                await writer.drain()
+                responses = [json.loads(await reader.readline()) for _ in requests]
+                writer.close()
+            return server.batcher.stats, {r["id"]: r for r in responses}
+        
+        with tempfile.TemporaryDirectory() as tmp:
+            stats, responses = asyncio.run(exchange(os.path.join(tmp, "calculator.sock")))
+        
+        self.assertEqual(responses[1]["result"], 8.0)
+        self.assertEqual(responses[2]["result"], 3.33)
+        self.assertEqual(responses[3]["error"], "Error: Division by zero")
+        self.assertTrue(responses[4]["error"].startswith("Error: Unknown operation"))
+        self.assertEqual(responses[5]["error"], "Error: Invalid expression")
+        self.assertEqual((stats.requests, stats.batches), (4, 1))
+        print(f"✓ Server: {stats.requests} pipelined requests in {stats.batches} batch")
+    
+    def test_server_client_disconnect_mid_batch_e2e(self):
+        """Test that requests of a disconnected client do not stop the rest of the batch."""
+        import calculator_server
+        
+        async def exchange(socket_path):
+            server = CalculatorServer(self.calculator, window=0.1)
+            listener = await server.start(unix_path=socket_path)
+            async with listener:
+                _, first_writer = await asyncio.open_unix_connection(socket_path)
+                first_writer.write(b'{"id": 1, "operation": "modulo", "a": 1, "b": 2}\n'
+                                   b'{"id": 2, "operation": "add", "a": 1, "b": 2}\n')
+                await first_writer.drain()
+                while len(server.batcher._pending) < 2:
+                    await asyncio.sleep(0.001)
+                # What handle_connection does when its client goes away: cancel its pending futures
+                for *_, future in server.batcher._pending:
+                    future.cancel()
+                first_writer.transport.abort()
+                
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                writer.write(b'{"id": 3, "operation": "add", "a": 1, "b": 2}\n'
+                             b'{"id": 4, "operation": "multiply", "a": 2, "b": 2}\n')
+                await writer.drain()
+                responses = [json.loads(await asyncio.wait_for(reader.readline(), 5)) for _ in range(2)]
+                writer.close()
+            return {r["id"]: r for r in responses}
+        
+        calculate_group = calculator_server.calculate_group
+        def failing_multiply(calculator, operation, a, b):
+            if operation == "multiply":
+                raise RuntimeError("batch failed")
+            return calculate_group(calculator, operation, a, b)
+        
+        with tempfile.TemporaryDirectory() as tmp, patch.object(calculator_server, "calculate_group", failing_multiply):
+            responses = asyncio.run(exchange(os.path.join(tmp, "calculator.sock")))
+        self.assertEqual(responses[3]["result"], 3.0)
+        self.assertIn("error", responses[4])
+        print("✓ Server: a disconnected client or a failed group does not block the batch")
+    
+    def test_metrics_e2e(self):
+        """Test per-operation call, error and latency metrics."""
+        self.assertNotIn("calculate", self.calculator.__dict__)
+        self.calculator.enable_metrics()
+        self.calculator.calculate("add", 1.0, 2.0)
+        self.calculator.calculate("add", 1.0, 2.0)
+        with self.assertRaises(ValueError):
+            self.calculator.calculate("divide", 1.0, 0.0)
+        with self.assertRaises(ValueError):
+            self.calculator.calculate("modulo", 1.0, 2.0)
+        
+        stats = self.calculator.stats()
+        self.assertEqual(stats["add"].calls, 2)
+        self.assertEqual(sum(stats["add"].latency_buckets), 2)
+        self.assertEqual(stats["divide"].errors, {"division_by_zero": 1})
+        self.assertEqual(stats["modulo"].errors, {"unknown_operation": 1})
+        self.assertGreater(stats["add"].percentile(99), 0.0)
+        
+        self.calculator.disable_metrics()
+        self.calculator.calculate("add", 1.0, 2.0)
+        self.assertEqual(self.calculator.stats()["add"].calls, 2)
+        self.calculator.reset_stats()
+        self.assertEqual(self.calculator.stats(), {})
+        print("✓ Metrics: calls, errors by type and latency histograms recorded")
+    
+    def test_reduce_e2e(self):
+        """Test streaming reductions round once and sum with compensation."""
+        # Chained calculate() rounds every step; reduce() rounds only the final sum
+        values = (0.004 for _ in range(1000))
+        self.assertEqual(self.calculator.reduce("add", values, chunk_size=64), 4.0)
+        
+        # Compensation keeps small terms that a naive float sum would lose
+        self.assertEqual(self.calculator.reduce("add", [1e16, 1.0, -1e16, 1.0]), 2.0)
+        self.assertEqual(self.calculator.reduce("subtract", iter([10.0, 1.5, 2.5]), chunk_size=2), 6.0)
+        self.assertEqual(self.calculator.reduce("multiply", np.array([1.5, 2.0, 4.0])), 12.0)
+        self.assertEqual(self.calculator.reduce("divide", array("d", [100.0, 2.0, 3.0])), 16.67)
+        # A left fold: the divisors' product would underflow to 0
+        self.assertEqual(self.calculator.reduce("divide", [1.0, 1e-200, 1e-200]), float("inf"))
+        
+        # Overflow and infinities give what chained calculate() calls give
+        self.assertEqual(self.calculator.reduce("add", [1e308, 1e308]), float("inf"))
+        self.assertEqual(self.calculator.reduce("add", [1e308, 1e308], chunk_size=1), float("inf"))
+        self.assertEqual(self.calculator.reduce("subtract", [-1e308, 1e308]), float("-inf"))
+        self.assertTrue(math.isnan(self.calculator.reduce("add", [float("inf"), float("-inf")])))
+        self.assertTrue(math.isnan(self.calculator.reduce("add", [float("inf"), 1.0, float("-inf")], chunk_size=1)))
+        self.assertEqual(self.calculator.reduce("multiply", [1e200, 1e200]), float("inf"))
+        
+        with self.assertRaisesRegex(ValueError, "Division by zero"):
+            self.calculator.reduce("divide", [1.0, 2.0, 0.0])
+        for operation in ("add", "subtract", "multiply", "divide"):
+            with self.assertRaisesRegex(ValueError, "empty"):
+                self.calculator.reduce(operation, [])
+        print("✓ Reduce: compensated sums, single final rounding")
+    
+    def test_concurrent_register_and_calculate_e2e(self):
+        """Test calculate on many threads while operations are re-registered."""
+        calculator = Calculator(self.config_path)
+        failures = []
+        
+        def calculate():
+            try:
+                for i in range(2000):
+                    self.assertEqual(calculator.calculate("multiply", float(i), 2.0), i * 2.0)
+            except Exception as e:
+                failures.append(e)
+        
+        threads = [threading.Thread(target=calculate) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for _ in range(200):
+            calculator.factory.register_lazy("multiply", "mul:Multiply")
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+        print("✓ Concurrency: lock-free reads during re-registration")
+    
+    def test_benchmark_compare_e2e(self):
+        """Test the benchmark suite flags regressions beyond the threshold."""
+        baseline = {"calculate.add.ns": 100.0, "evaluate.ns": 200.0, "removed.ns": 1.0}
+        current = {"calculate.add.ns": 105.0, "evaluate.ns": 260.0, "added.ns": 1.0}
+        regressions = bench_calculator.compare(current, baseline, threshold=0.10)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("evaluate.ns"))
+        print(f"✓ Benchmark compare: {regressions}")
 
 def run_e2e_tests():
     """Run all end-to-end tests."""
@@ -21,3 +21,24 @@ class BaseModule(ABC):
         Execute the module.
         """
         pass
+
+    def execute_batch(self, kwargs_list: list[dict]) -> list:
+        """
+        Execute the module once per kwargs dict and return the results in order.
+        Modules that can process a batch faster than call by call override this.
+        """
+        execute = self.execute
+        return [execute(**kwargs) for kwargs in kwargs_list]
+
+    async def execute_async(self, **kwargs) -> str:
+        """
+        Execute the module without blocking the event loop.
+        Runs execute() in a worker thread, or directly on the event loop when
+        args.execution is "inline"; I/O-bound modules override this with a
+        native coroutine.
+        """
+        if self.config.args and self.config.args.get("execution") == "inline":
+            return self.execute(**kwargs)
+        # Imported here, where an event loop is already running, to keep module imports light
+        import asyncio
+        return await asyncio.to_thread(self.execute, **kwargs)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark for what hooks add to ModuleManager.execute_module.
+
+Every manager runs the same greet call. "plain" never had a hook and
+"removed" had one added and removed, which should both dispatch straight to
+the module. "noop-N" registers N do-nothing hooks to show the cost per hook,
+"metrics" records ModuleMetrics and "spans" also appends a SpanFileHook line
+per call.
+"""
+
+from module_hooks import ModuleHook, SpanFileHook
+from module_manager import ModuleManager
+import argparse
+import os
+import tempfile
+import timeit
+
+def build_managers(config_path: str, spans: SpanFileHook, noop_counts: list[int]) -> dict[str, ModuleManager]:
+    managers = {"plain": ModuleManager(config_path)}
+    removed = managers["removed"] = ModuleManager(config_path)
+    hook = ModuleHook()
+    removed.add_hook(hook)
+    removed.remove_hook(hook)
+    for count in noop_counts:
+        manager = managers[f"noop-{count}"] = ModuleManager(config_path)
+        for _ in range(count):
+            manager.add_hook(ModuleHook())
+    managers["metrics"] = ModuleManager(config_path)
+    managers["metrics"].enable_metrics()
+    managers["spans"] = ModuleManager(config_path)
+    managers["spans"].enable_metrics()
+    managers["spans"].add_hook(spans)
+    return managers
+
+def run(managers: dict[str, ModuleManager], calls: int, repeat: int) -> dict[str, float]:
+    """
+    Returns each manager's best nanoseconds per execute_module() call. Each
+    round times every manager once, so drift in machine load is shared.
+    """
+    timings = {}
+    for _ in range(repeat):
+        for label, manager in managers.items():
+            call = manager.execute_module
+            elapsed = timeit.timeit(lambda: call("greet", greeting="Hello"), number=calls)
+            timings[label] = min(timings.get(label, float("inf")), elapsed * 1e9 / calls)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure the per-call cost of execute_module hooks.")
+    parser.add_argument("--calls", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--noop", type=int, nargs="+", default=[1, 4, 16], help="No-op hook counts to time")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        spans = SpanFileHook(os.path.join(directory, "spans.jsonl"))
+        managers = build_managers(args.config, spans, args.noop)
+        try:
+            timings = run(managers, args.calls, args.repeat)
+        finally:
+            for manager in managers.values():
+                manager.close()
+            spans.close()
+
+    plain = timings["plain"]
+    print(f"{'manager':<10} {'ns/call':>9} {'added ns':>9}")
+    for label, ns in timings.items():
+        print(f"{label:<10} {ns:>9.1f} {ns - plain:>9.1f}")
+
+if __name__ == "__main__":
+    main()
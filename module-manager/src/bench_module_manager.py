@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Startup and dispatch benchmark suite for ModuleManager at scale.
+
+Generates synthetic config.yaml files with N echo-style modules and
+measures load_config_from_yaml, load_module_config, ModuleManager.__init__,
+a module's first use, and get_module()/execute_module() cost for the first,
+middle and last module in the list. Writes the results as JSON; with
+--compare, fails when any metric regresses beyond the threshold against a
+saved baseline. Every metric is a time per unit, so lower is better.
+"""
+
+from datetime import datetime, timezone
+from module_config import load_config_from_yaml, load_module_config
+from module_factory import ModuleFactory
+from module_manager import ModuleManager
+import argparse
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+import timeit
+
+DEFAULT_SIZES = (10, 1_000, 100_000)
+# Sizes above this are timed once: parsing 100k entries takes tens of seconds
+REPEAT_LIMIT = 10_000
+
+def module_name(index: int) -> str:
+    return f"echo_{index}"
+
+def write_config(path: str, size: int) -> None:
+    """
+    Writes a config with size modules, each registered as an Echo module type.
+    """
+    with open(path, "w") as file:
+        file.write("module-manager:\n  modules:\n")
+        for index in range(size):
+            file.write(
+                f"    - name: {module_name(index)}\n"
+                f"      description: \"Synthetic module {index}\"\n"
+                f"      args:\n"
+                f"        message: \"{{message}}\"\n"
+            )
+    for index in range(size):
+        ModuleFactory.register_module(module_name(index), "services.echo:Echo")
+
+def _once(function) -> float:
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+def _best(function, number: int, repeat: int) -> float:
+    """
+    Returns the best time in seconds of one call to function.
+    """
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+def run_size(config_path: str, size: int, calls: int, repeat: int) -> dict[str, float]:
+    """
+    Runs every benchmark against a config of the given size.
+
+    Returns:
+        dict[str, float]: Metric name to milliseconds (startup) or nanoseconds (per call).
+    """
+    metrics = {}
+    prefix = f"{size}."
+    if size > REPEAT_LIMIT:
+        repeat = 1
+
+    metrics[prefix + "load_config_from_yaml.ms"] = min(
+        _once(lambda: load_config_from_yaml(config_path)) for _ in range(repeat)) * 1e3
+    config = load_config_from_yaml(config_path)
+    metrics[prefix + "load_module_config.ms"] = min(
+        _once(lambda: load_module_config(config)) for _ in range(repeat)) * 1e3
+    metrics[prefix + "init.ms"] = min(_once(lambda: ModuleManager(config_path)) for _ in range(repeat)) * 1e3
+
+    manager = ModuleManager(config_path)
+    positions = {"first": 0, "middle": size // 2, "last": size - 1}
+    for position, index in positions.items():
+        name = module_name(index)
+        metrics[f"{prefix}first_use.{position}.ns"] = _once(lambda: manager.get_module(name)) * 1e9
+        metrics[f"{prefix}get_module.{position}.ns"] = _best(lambda: manager.get_module(name), calls, repeat) * 1e9
+        metrics[f"{prefix}execute_module.{position}.ns"] = _best(
+            lambda: manager.execute_module(name, message="hi"), calls, repeat) * 1e9
+    return metrics
+
+def run_suite(sizes: list[int], calls: int, repeat: int) -> dict[str, float]:
+    """
+    Runs every size, then drops the synthetic module types that
+    write_config registered from the factory.
+    """
+    metrics = {}
+    registry = dict(ModuleFactory._module_registry)
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for size in sizes:
+                config_path = os.path.join(directory, f"config-{size}.yaml")
+                write_config(config_path, size)
+                metrics.update(run_size(config_path, size, calls, repeat))
+    finally:
+        ModuleFactory._module_registry.clear()
+        ModuleFactory._module_registry.update(registry)
+    return metrics
+
+def compare(current: dict[str, float], baseline: dict[str, float], threshold: float) -> list[str]:
+    """
+    Lists the metrics that are slower than the baseline by more than threshold
+    (e.g. 0.1 for 10%). Metrics missing from either side are ignored.
+    """
+    regressions = []
+    for name, value in sorted(current.items()):
+        previous = baseline.get(name)
+        if previous and value > previous * (1 + threshold):
+            regressions.append(f"{name}: {previous:.1f} -> {value:.1f} ({(value / previous - 1) * 100:+.1f}%)")
+    return regressions
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="ModuleManager startup and dispatch benchmark suite.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Module counts to generate")
+    parser.add_argument("--calls", type=int, default=100_000, help="Calls per get_module/execute_module timing")
+    parser.add_argument("--repeat", type=int, default=3, help=f"Repetitions per benchmark (1 above {REPEAT_LIMIT} modules)")
+    parser.add_argument("--output", help="Write results as JSON to this file (defaults to stdout)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown, e.g. 0.10 for 10%%")
+    args = parser.parse_args(argv)
+
+    logging.getLogger("module_manager").setLevel(logging.WARNING)
+    results = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "metrics": run_suite(args.sizes, args.calls, args.repeat),
+    }
+    report = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["metrics"]
+        regressions = compare(results["metrics"], baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time as midnight
+from typing import Optional
+from module_config import ModuleConfig
+import time
+
+# Values of a module's args.cache:
+#   none  - every call executes (default)
+#   pure  - results depend only on the kwargs and are kept until evicted
+#   ttl   - like pure, but entries expire args.cache_ttl seconds after they are stored
+#   daily - like pure, but entries expire at the local midnight after the call started
+CACHE_POLICIES = ("none", "pure", "ttl", "daily")
+DEFAULT_CACHE_SIZE = 1024
+
+# Returned by ModuleCache.get on a miss, since None could be a cached result
+MISSING = object()
+
+@dataclass
+class CacheStats:
+    """Module result cache counters."""
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    max_size: int
+
+class ModuleCache:
+    """
+    Bounded LRU of one module's results keyed by the call kwargs, with an
+    optional expiry per entry. execute_many and pipeline stages hit the same
+    module from several threads, so get and put take no lock: each touches
+    the OrderedDict once, and losing a race (an entry evicted in between)
+    only costs a re-execution. The counters may undercount under contention.
+    """
+    def __init__(self, policy: str, max_size: int = DEFAULT_CACHE_SIZE, ttl: Optional[float] = None):
+        if policy not in CACHE_POLICIES or policy == "none":
+            raise ValueError(f"Unknown cache policy: {policy}")
+        if policy == "ttl" and not ttl:
+            raise ValueError("The ttl cache policy requires a positive cache_ttl")
+        self.policy = policy
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def key(self, kwargs: dict) -> Optional[tuple]:
+        """
+        Returns the cache key of a call, or None when a kwarg is unhashable
+        (such calls are executed without caching). Daily keys start with the
+        day the call started, since its result may be stored after midnight.
+        """
+        key = tuple(sorted(kwargs.items()))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        if self.policy == "daily":
+            return (date.fromtimestamp(time.time()).toordinal(), *key)
+        return key
+
+    def _expires_at(self, key: tuple) -> float:
+        if self.policy == "ttl":
+            return time.time() + self.ttl
+        if self.policy == "daily":
+            return datetime.combine(date.fromordinal(key[0] + 1), midnight()).timestamp()
+        return float("inf")
+
+    def get(self, key: tuple) -> object:
+        """
+        Returns the cached result for key, or MISSING when absent or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None or entry[1] <= time.time():
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        try:
+            self._entries.move_to_end(key)
+        except KeyError:
+            pass
+        return entry[0]
+
+    def put(self, key: tuple, value: object) -> None:
+        """
+        Stores a result, evicting the least recently used entry when full.
+        """
+        if self.max_size <= 0:
+            return
+        if key not in self._entries and len(self._entries) >= self.max_size:
+            try:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+            except KeyError:
+                pass
+        self._entries[key] = (value, self._expires_at(key))
+
+    def clear(self) -> None:
+        """
+        Drops every cached result. Counters are kept.
+        """
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Returns a snapshot of the cache counters.
+        """
+        return CacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            size=len(self._entries),
+            max_size=self.max_size
+        )
+
+def cache_for(config: ModuleConfig) -> Optional[ModuleCache]:
+    """
+    Builds the result cache a module declares in its args (cache, cache_size,
+    cache_ttl), or returns None for uncached modules.
+    """
+    args = config.args or {}
+    policy = args.get("cache", "none")
+    if policy == "none":
+        return None
+    try:
+        return ModuleCache(policy, args.get("cache_size", DEFAULT_CACHE_SIZE), args.get("cache_ttl"))
+    except ValueError as e:
+        raise ValueError(f"Module {config.name}: {e}") from None
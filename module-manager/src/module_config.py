@@ -1,4 +1,4 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional
 import os
 import yaml
@@ -13,6 +13,54 @@ class ModuleConfig:
     description: str
     args: dict
 
+@dataclass
+class ManagerConfig:
+    """
+    Module manager settings.
+    """
+    max_concurrency: int
+    default_timeout: Optional[float]
+    process_workers: Optional[int]
+    metrics: bool = False
+    plugin_entry_points: bool = False
+    plugins_dir: Optional[str] = None
+
+@dataclass
+class StageConfig:
+    """
+    One stage of a pipeline: the module it runs, the kwarg that receives
+    each item (None to pass dict items as kwargs), fixed extra kwargs and
+    the number of worker threads.
+    """
+    module: str
+    input: Optional[str] = None
+    args: dict = field(default_factory=dict)
+    workers: int = 1
+
+@dataclass
+class PipelineConfig:
+    """
+    A chain of module stages. Items move between stages in batches of
+    batch_size through queues holding at most queue_size batches.
+    """
+    name: str
+    stages: list[StageConfig]
+    batch_size: int = 1
+    queue_size: int = 8
+
+# Values of a module's args.execution: run on the caller, in a thread
+# (for async calls), or in the process pool
+EXECUTION_POLICIES = ("inline", "thread", "process")
+
+def execution_policy(config: ModuleConfig) -> str:
+    """
+    Returns the execution policy declared in the module's args.
+    """
+    policy = (config.args or {}).get("execution", "thread")
+    if policy not in EXECUTION_POLICIES:
+        raise ValueError(f"Unknown execution policy for module {config.name}: {policy}")
+    return policy
+
 class ModuleConfigBuilder:
     """
     Builder for the module config.
@@ -59,6 +107,43 @@ def load_module_config(config: dict) -> list[ModuleConfig]:
     
     return module_configs
 
+def load_manager_config(config: dict) -> ManagerConfig:
+    """
+    Loads the manager-wide settings from the given config.
+    """
+    manager_config = config.get("module-manager") or {}
+    return ManagerConfig(
+        max_concurrency=manager_config.get("max_concurrency", 16),
+        default_timeout=manager_config.get("default_timeout"),
+        process_workers=manager_config.get("process_workers"),
+        metrics=manager_config.get("metrics", False),
+        plugin_entry_points=manager_config.get("plugin_entry_points", False),
+        plugins_dir=manager_config.get("plugins_dir")
+    )
+
+def load_pipeline_config(config: dict) -> list[PipelineConfig]:
+    """
+    Loads the pipelines declared under module-manager.pipelines.
+    """
+    pipeline_configs = []
+    for pipeline_data in (config.get("module-manager") or {}).get("pipelines") or []:
+        stages = [
+            StageConfig(
+                module=stage["module"],
+                input=stage.get("input"),
+                args=stage.get("args") or {},
+                workers=stage.get("workers", 1)
+            )
+            for stage in pipeline_data["stages"]
+        ]
+        pipeline_configs.append(PipelineConfig(
+            name=pipeline_data["name"],
+            stages=stages,
+            batch_size=pipeline_data.get("batch_size", 1),
+            queue_size=pipeline_data.get("queue_size", 8)
+        ))
+    return pipeline_configs
+
 def load_config_from_yaml(yaml_file_path: str) -> dict:
     """
     Loads configuration from a YAML file.
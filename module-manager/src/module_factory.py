@@ -1,35 +1,72 @@
 from base_module import BaseModule
 from module_config import ModuleConfig
-from services.greet import Greet
-from services.echo import Echo
-from services.date import Date
+from module_plugins import discover_plugins
+from typing import Optional
+import importlib
+import os
+import sys
 
 
 class ModuleFactory:
     """
     Factory for creating modules based on their configuration.
+    Module classes are registered as "package.module:Class" import strings
+    and imported the first time a module of that type is created.
     """
     
-    _module_registry = {
-        "greet": Greet,
-        "echo": Echo,
-        "date": Date,
+    _module_registry: dict[str, type | str] = {
+        "greet": "services.greet:Greet",
+        "echo": "services.echo:Echo",
+        "date": "services.date:Date",
     }
     
+    @classmethod
+    def get_module_class(cls, name: str) -> type:
+        """
+        Resolve a module type to its class, importing it on first use.
+        """
+        module_class = cls._module_registry.get(name)
+        if not module_class:
+            raise ValueError(f"Unknown module type: {name}")
+        if isinstance(module_class, str):
+            module_path, _, class_name = module_class.partition(":")
+            try:
+                module_class = getattr(importlib.import_module(module_path), class_name)
+            except (ImportError, AttributeError) as e:
+                raise ValueError(f"Cannot import module type {name} from {cls._module_registry[name]}: {e}")
+            cls._module_registry[name] = module_class
+        return module_class
+    
     @classmethod
     def create_module(cls, config: ModuleConfig) -> BaseModule:
         """
         Create a module instance based on the configuration.
         """
-        module_class = cls._module_registry.get(config.name)
-        if not module_class:
-            raise ValueError(f"Unknown module type: {config.name}")
-        
-        return module_class(config)
+        return cls.get_module_class(config.name)(config)
     
     @classmethod
-    def register_module(cls, name: str, module_class: type):
+    def register_module(cls, name: str, module_class: type | str):
         """
-        Register a new module type.
+        Register a new module type, as a class or a "package.module:Class" import string.
         """
         cls._module_registry[name] = module_class
+
+    @classmethod
+    def load_plugins(cls, plugins_dir: Optional[str] = None, entry_points: bool = True,
+                     manifest_path: Optional[str] = None) -> list[str]:
+        """
+        Register the module types published by installed distributions under
+        the "module_manager.modules" entry point group and the BaseModule
+        subclasses defined in plugins_dir. Discovery goes through a cached
+        manifest, and plugins are only imported when first created. Types
+        already registered are kept. Returns the newly registered types.
+        """
+        plugins = discover_plugins(plugins_dir, entry_points, manifest_path)
+        if plugins_dir is not None:
+            plugins_dir = os.path.abspath(plugins_dir)
+            if plugins_dir not in sys.path:
+                sys.path.append(plugins_dir)
+        added = [name for name in plugins if name not in cls._module_registry]
+        for name in added:
+            cls._module_registry[name] = plugins[name]
+        return added
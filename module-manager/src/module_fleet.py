@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Fleet of worker processes, each with its own ModuleManager, served over
+Unix sockets.
+
+The Supervisor starts one worker per socket, by default in a new private
+directory (mode 0700, since payloads are pickles), and restarts workers
+that die. Every message is a frame: a 9-byte header (request id u32,
+status u8, payload length u32, big-endian) followed by a pickled payload.
+Requests carry (module_name, kwargs); responses carry the result
+(status 0) or the exception (status 1) and may arrive out of order, so
+requests can be pipelined on one connection.
+
+FleetClient offers execute_module like ModuleManager. It routes each call
+by module name, either "sticky" (a module always goes to the same worker,
+keeping its instance and cache warm) or "balanced" (round-robin), and
+reuses connections from a pool per worker.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from module_manager import ModuleManager
+from typing import Any, Iterable, Optional
+import argparse
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import pickle
+import queue
+import shutil
+import socket
+import struct
+import tempfile
+import threading
+import time
+import zlib
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+HEADER = struct.Struct("!IBI")
+STATUS_OK = 0
+STATUS_ERROR = 1
+ROUTING_POLICIES = ("sticky", "balanced")
+
+def encode_frame(request_id: int, status: int, payload: Any) -> bytes:
+    data = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+    return HEADER.pack(request_id, status, len(data)) + data
+
+def _error_payload(error: BaseException) -> bytes:
+    """Pickles an exception, falling back to a RuntimeError with its repr."""
+    try:
+        return pickle.dumps(error, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return pickle.dumps(RuntimeError(repr(error)), protocol=pickle.HIGHEST_PROTOCOL)
+
+class WorkerServer:
+    """
+    Serves one ModuleManager on a Unix socket. Each request runs in a
+    thread as soon as it is read, so pipelined requests run concurrently.
+    """
+    def __init__(self, manager: ModuleManager, threads: Optional[int] = None):
+        self.manager = manager
+        self.executor = ThreadPoolExecutor(max_workers=threads)
+
+    async def _respond(self, writer: asyncio.StreamWriter, request_id: int, module_name: str, kwargs: dict) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self.executor, lambda: self.manager.execute_module(module_name, **kwargs))
+            data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            status = STATUS_OK
+        except Exception as e:
+            data = _error_payload(e)
+            status = STATUS_ERROR
+        if not writer.is_closing():
+            writer.write(HEADER.pack(request_id, status, len(data)) + data)
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        tasks = set()
+        try:
+            while True:
+                header = await reader.readexactly(HEADER.size)
+                request_id, _, length = HEADER.unpack(header)
+                module_name, kwargs = pickle.loads(await reader.readexactly(length))
+                task = asyncio.create_task(self._respond(writer, request_id, module_name, kwargs))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def serve(self, socket_path: str, ready=None) -> None:
+        server = await asyncio.start_unix_server(self.handle_connection, path=socket_path)
+        if ready is not None:
+            ready.set()
+        async with server:
+            await server.serve_forever()
+
+def _run_worker(config_path: str, socket_path: str, ready) -> None:
+    """Entry point of a worker process."""
+    manager = ModuleManager(config_path)
+    try:
+        asyncio.run(WorkerServer(manager).serve(socket_path, ready))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manager.close()
+
+class Supervisor:
+    """
+    Starts and watches a fleet of module worker processes. Workers are
+    spawned, not forked, so they only know the modules that config.yaml
+    and ModuleFactory's import strings declare.
+    """
+    def __init__(self, config_path: str, workers: Optional[int] = None, socket_dir: Optional[str] = None,
+                 check_interval: float = 0.5):
+        self.config_path = os.path.abspath(config_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.check_interval = check_interval
+        self.restarts = 0
+        self._owns_dir = socket_dir is None
+        self.socket_dir = socket_dir or tempfile.mkdtemp(prefix="module-fleet-")
+        self.socket_paths = [os.path.join(self.socket_dir, f"worker-{index}.sock") for index in range(self.workers)]
+        self._context = multiprocessing.get_context("spawn")
+        self._processes: list[Optional[multiprocessing.Process]] = [None] * self.workers
+        self._stop = threading.Event()
+        self._monitor: Optional[threading.Thread] = None
+
+    def _start_worker(self, index: int, timeout: float = 30.0) -> None:
+        ready = self._context.Event()
+        process = self._context.Process(
+            target=_run_worker, args=(self.config_path, self.socket_paths[index], ready),
+            name=f"module-worker-{index}", daemon=True
+        )
+        process.start()
+        if not ready.wait(timeout):
+            process.terminate()
+            raise RuntimeError(f"Module worker {index} did not start within {timeout}s")
+        self._processes[index] = process
+
+    def start(self) -> "Supervisor":
+        """Starts every worker and the thread that restarts dead ones."""
+        for index in range(self.workers):
+            self._start_worker(index)
+        self._monitor = threading.Thread(target=self._watch, daemon=True)
+        self._monitor.start()
+        logger.info(f"Started {self.workers} module workers in {self.socket_dir}")
+        return self
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            for index, process in enumerate(self._processes):
+                if process is not None and not process.is_alive() and not self._stop.is_set():
+                    logger.warning(f"Module worker {index} exited with code {process.exitcode}, restarting it")
+                    try:
+                        self._start_worker(index)
+                        self.restarts += 1
+                    except Exception as e:
+                        logger.error(f"Failed to restart module worker {index}: {e}")
+
+    def client(self, routing: str = "sticky", pool_size: int = 4) -> "FleetClient":
+        return FleetClient(self.socket_paths, routing, pool_size)
+
+    def stop(self) -> None:
+        """Stops every worker and removes the socket directory if it was created here."""
+        self._stop.set()
+        if self._monitor is not None:
+            self._monitor.join()
+            self._monitor = None
+        for process in self._processes:
+            if process is not None:
+                process.terminate()
+        for process in self._processes:
+            if process is not None:
+                process.join()
+        self._processes = [None] * self.workers
+        if self._owns_dir:
+            shutil.rmtree(self.socket_dir, ignore_errors=True)
+
+    def __enter__(self) -> "Supervisor":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+class _Connection:
+    """A blocking client connection to one worker."""
+    def __init__(self, socket_path: str):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(socket_path)
+        self.file = self.socket.makefile("rb")
+        self._ids = itertools.count()
+
+    def send(self, calls: list[tuple[str, dict]]) -> list[int]:
+        request_ids = [next(self._ids) & 0xFFFFFFFF for _ in calls]
+        self.socket.sendall(b"".join(
+            encode_frame(request_id, STATUS_OK, call) for request_id, call in zip(request_ids, calls)
+        ))
+        return request_ids
+
+    def receive(self) -> tuple[int, int, bytes]:
+        header = self.file.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ConnectionError("Module worker closed the connection")
+        request_id, status, length = HEADER.unpack(header)
+        return request_id, status, self.file.read(length)
+
+    def close(self) -> None:
+        self.file.close()
+        self.socket.close()
+
+class FleetClient:
+    """
+    Client for a Supervisor's workers. Safe to share between threads: each
+    call borrows a connection per worker from the pool and returns it once
+    every response has been read.
+    """
+    def __init__(self, socket_paths: list[str], routing: str = "sticky", pool_size: int = 4):
+        if routing not in ROUTING_POLICIES:
+            raise ValueError(f"Unknown routing policy: {routing}")
+        if not socket_paths:
+            raise ValueError("No module workers to connect to")
+        self.socket_paths = list(socket_paths)
+        self.routing = routing
+        self._pools = [queue.LifoQueue(pool_size) for _ in self.socket_paths]
+        self._next = itertools.count()
+
+    def _route(self, module_name: str) -> int:
+        if self.routing == "sticky":
+            return zlib.crc32(module_name.encode()) % len(self.socket_paths)
+        return next(self._next) % len(self.socket_paths)
+
+    def _acquire(self, worker: int) -> _Connection:
+        try:
+            return self._pools[worker].get_nowait()
+        except queue.Empty:
+            return _Connection(self.socket_paths[worker])
+
+    def _release(self, worker: int, connection: _Connection) -> None:
+        try:
+            self._pools[worker].put_nowait(connection)
+        except queue.Full:
+            connection.close()
+
+    def execute_module(self, module_name: str, **kwargs):
+        """Execute a module on a worker and return its result, or raise its error."""
+        return self.execute_pipelined([(module_name, kwargs)])[0]
+
+    def execute_pipelined(self, calls: Iterable[tuple[str, dict]]) -> list:
+        """
+        Sends every (module_name, kwargs) call before reading any response,
+        one connection per worker, and returns the results in call order.
+        Raises the first error once every response has been read.
+        """
+        by_worker: dict[int, list[int]] = {}
+        calls = list(calls)
+        for position, (module_name, _) in enumerate(calls):
+            by_worker.setdefault(self._route(module_name), []).append(position)
+
+        results: list = [None] * len(calls)
+        errors: dict[int, BaseException] = {}
+        sent: list[tuple[int, _Connection, dict[int, int]]] = []
+        try:
+            for worker, positions in by_worker.items():
+                connection, request_ids = self._send(worker, [calls[position] for position in positions])
+                sent.append((worker, connection, dict(zip(request_ids, positions))))
+            while sent:
+                worker, connection, waiting = sent[-1]
+                while waiting:
+                    request_id, status, data = connection.receive()
+                    position = waiting.pop(request_id)
+                    if status == STATUS_OK:
+                        results[position] = pickle.loads(data)
+                    else:
+                        errors[position] = pickle.loads(data)
+                sent.pop()
+                self._release(worker, connection)
+        finally:
+            # Connections with unread responses cannot be reused
+            for _, connection, _ in sent:
+                connection.close()
+        if errors:
+            raise errors[min(errors)]
+        return results
+
+    def _send(self, worker: int, calls: list[tuple[str, dict]]) -> tuple[_Connection, list[int]]:
+        """
+        Sends calls on a pooled connection. A pooled connection whose worker
+        was restarted fails on send, before any request reached a worker, so
+        the send is retried once on a new connection.
+        """
+        connection = self._acquire(worker)
+        try:
+            return connection, connection.send(calls)
+        except OSError:
+            connection.close()
+        connection = _Connection(self.socket_paths[worker])
+        try:
+            return connection, connection.send(calls)
+        except BaseException:
+            connection.close()
+            raise
+
+    def close(self) -> None:
+        """Closes every pooled connection."""
+        for pool in self._pools:
+            while True:
+                try:
+                    pool.get_nowait().close()
+                except queue.Empty:
+                    break
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve modules from a fleet of worker processes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--socket-dir", help="Directory for the worker sockets (defaults to a new private one)")
+    parser.add_argument("--config", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.yaml"))
+    args = parser.parse_args()
+
+    supervisor = Supervisor(args.config, args.workers, args.socket_dir).start()
+    for path in supervisor.socket_paths:
+        print(path, flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        supervisor.stop()
+
+if __name__ == "__main__":
+    main()
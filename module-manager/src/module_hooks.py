@@ -0,0 +1,104 @@
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from itertools import accumulate
+from typing import Any, Optional
+import json
+import threading
+import time
+
+# Upper bounds in seconds of the latency buckets. Module calls range from a
+# cached lookup (microseconds) to process or network modules (seconds), so
+# the bounds step 1-2-5 per decade from 1us to 50s; slower calls overflow.
+LATENCY_BUCKETS = tuple(float(f"{step}e{exponent}") for exponent in range(-6, 2) for step in (1, 2, 5))
+
+class ModuleHook:
+    """
+    Callbacks around ModuleManager.execute_module. before() runs ahead of
+    the call and may return a context object, which after() receives along
+    with the call's latency and the error it raised, if any.
+    """
+    def before(self, module_name: str, kwargs: dict) -> Any:
+        return None
+
+    def after(self, module_name: str, context: Any, seconds: float, error: Optional[BaseException]) -> None:
+        pass
+
+@dataclass
+class ModuleStats:
+    """A module's call count, errors by exception type and latency histogram."""
+    calls: int = 0
+    errors: dict[str, int] = field(default_factory=dict)
+    latency_buckets: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def percentile(self, percent: float) -> float:
+        """
+        Returns the latency at or below which the given percent of calls
+        finished, rounded up to a bucket bound: inf when that falls among
+        the overflowing calls, 0.0 before any call.
+        """
+        cumulative = list(accumulate(self.latency_buckets))
+        if not cumulative[-1]:
+            return 0.0
+        index = bisect_left(cumulative, cumulative[-1] * percent / 100)
+        return LATENCY_BUCKETS[index] if index < len(LATENCY_BUCKETS) else float("inf")
+
+class ModuleMetrics(ModuleHook):
+    """
+    Hook that keeps a ModuleStats per module name. Updates take no lock, so
+    counts from concurrent execute_module calls are best effort.
+    """
+    def __init__(self):
+        self._modules: dict[str, ModuleStats] = {}
+
+    def after(self, module_name: str, context: Any, seconds: float, error: Optional[BaseException]) -> None:
+        stats = self._modules.get(module_name)
+        if stats is None:
+            stats = self._modules[module_name] = ModuleStats()
+        stats.calls += 1
+        stats.latency_buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        if error is not None:
+            error_type = type(error).__name__
+            stats.errors[error_type] = stats.errors.get(error_type, 0) + 1
+
+    def snapshot(self) -> dict[str, ModuleStats]:
+        """
+        Returns a copy of the counters of every module.
+        """
+        return {
+            name: ModuleStats(stats.calls, dict(stats.errors), list(stats.latency_buckets))
+            for name, stats in self._modules.items()
+        }
+
+    def reset(self) -> None:
+        """
+        Clears every counter.
+        """
+        self._modules = {}
+
+class SpanFileHook(ModuleHook):
+    """
+    Appends one JSON line per call to a file, for a local trace collector:
+    {"module", "start" (epoch seconds), "duration_ms", "error"}.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "a")
+
+    def before(self, module_name: str, kwargs: dict) -> float:
+        return time.time()
+
+    def after(self, module_name: str, context: float, seconds: float, error: Optional[BaseException]) -> None:
+        span = {
+            "module": module_name,
+            "start": context,
+            "duration_ms": seconds * 1e3,
+            "error": repr(error) if error is not None else None
+        }
+        line = json.dumps(span) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
@@ -1,32 +1,548 @@
 from base_module import BaseModule
-from module_config import load_module_config, load_config_from_yaml
+from module_config import (ManagerConfig, ModuleConfig, PipelineConfig, StageConfig, execution_policy, load_module_config,
+                           load_manager_config, load_pipeline_config, load_config_from_yaml)
+from module_cache import MISSING, CacheStats, ModuleCache, cache_for
 from module_factory import ModuleFactory
+from module_hooks import ModuleHook, ModuleMetrics, ModuleStats
+from pipeline import Pipeline, build_pipeline
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator, NamedTuple, Optional
+import itertools
+import logging
+import os
+import threading
+
+if TYPE_CHECKING:
+    from process_pool import ModuleProcessPool
+    import asyncio
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ModuleRequest:
+    """
+    A single module call for execute_many.
+    """
+    module_name: str
+    kwargs: dict = field(default_factory=dict)
+    timeout: Optional[float] = None
+
+@dataclass
+class ModuleResult:
+    """
+    The outcome of a ModuleRequest: its result, or the error it raised.
+    """
+    index: int
+    module_name: str
+    result: Any = None
+    error: Optional[BaseException] = None
+
+class ModuleRegistry(NamedTuple):
+    """
+    The modules of a ModuleManager. A config reload builds a new registry and
+    publishes it with a single attribute assignment, so calls in flight see
+    either the old modules or the new ones, never a mix.
+    """
+    order: dict[str, None]
+    pending: dict[str, ModuleConfig]
+    index: dict[str, BaseModule]
+    caches: dict[str, ModuleCache]
+
+@dataclass
+class ReloadResult:
+    """
+    The module names a config reload added, re-created and removed.
+    """
+    added: list[str] = field(default_factory=list)
+    changed: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
 
 class ModuleManager:
     def __init__(self, config_path: str):
-        self.configs = load_module_config(load_config_from_yaml(config_path))
-        self.modules: list[BaseModule] = []
+        self.config_path = config_path
+        self._config_stat = self._stat_config()
+        config = load_config_from_yaml(config_path)
+        self.configs = load_module_config(config)
+        self.settings = load_manager_config(config)
+        self.pipeline_configs = load_pipeline_config(config)
+        self._load_plugins(self.settings)
+        self._write_lock = threading.RLock()
+        self._registry = ModuleRegistry({}, {}, {}, {})
+        self._process_pool: Optional["ModuleProcessPool"] = None
+        self._watcher: Optional[threading.Thread] = None
+        self._stop_watching = threading.Event()
+        self._hooks: tuple[ModuleHook, ...] = ()
+        self.metrics: Optional[ModuleMetrics] = None
+        if self.settings.metrics:
+            self.enable_metrics()
         self._auto_register_modules()
+        self._pipelines = self._build_pipelines(self.pipeline_configs, self._registry.order)
 
     def _auto_register_modules(self):
-        """Automatically register modules using the factory pattern."""
+        """Register every configured module; each is created by the factory on first use."""
+        registry = self._registry
         for config in self.configs:
-            module = ModuleFactory.create_module(config)
-            self.modules.append(module)
+            if config.name in registry.order:
+                raise ValueError(f"Module {config.name} already registered")
+            execution_policy(config)
+            registry.order[config.name] = None
+            registry.pending[config.name] = config
+            self._set_cache(registry, config.name, config)
+
+    @staticmethod
+    def _set_cache(registry: ModuleRegistry, module_name: str, config: Optional[ModuleConfig]):
+        """Install (or drop) the result cache declared in a module's config."""
+        cache = cache_for(config) if config is not None else None
+        if cache is None:
+            registry.caches.pop(module_name, None)
+        else:
+            registry.caches[module_name] = cache
+
+    def _build(self, config: ModuleConfig) -> BaseModule:
+        if execution_policy(config) == "process":
+            from process_pool import ProcessModule
+            return ProcessModule(config, self.process_pool())
+        return ModuleFactory.create_module(config)
+
+    def _create(self, module_name: str) -> BaseModule:
+        """Create a configured module that has not been used yet."""
+        with self._write_lock:
+            registry = self._registry
+            module = registry.index.get(module_name)
+            if module is not None:
+                return module
+            try:
+                config = registry.pending[module_name]
+            except KeyError:
+                raise ValueError(f"Module {module_name} not found") from None
+            module = registry.index[module_name] = self._build(config)
+            del registry.pending[module_name]
+            return module
+
+    def process_pool(self) -> "ModuleProcessPool":
+        """Return the worker pool for process-mode modules, starting it on first use."""
+        if self._process_pool is None:
+            # Imported here: multiprocessing is only needed once a process-mode module is built
+            from process_pool import ModuleProcessPool
+            self._process_pool = ModuleProcessPool(self.settings.process_workers)
+        return self._process_pool
+
+    def close(self):
+        """Stop watching the config file and shut down the process pool, if one was started."""
+        self.stop_watching()
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def _load_plugins(self, settings: ManagerConfig):
+        """Register the plugin module types the settings ask for."""
+        if not settings.plugin_entry_points and settings.plugins_dir is None:
+            return
+        plugins_dir = settings.plugins_dir
+        if plugins_dir is not None:
+            plugins_dir = os.path.join(os.path.dirname(os.path.abspath(self.config_path)), plugins_dir)
+        ModuleFactory.load_plugins(plugins_dir, settings.plugin_entry_points)
+
+    def _stat_config(self) -> Optional[tuple[int, int]]:
+        try:
+            stat = os.stat(self.config_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def reload(self) -> ReloadResult:
+        """
+        Re-read the config file and apply it. Modules whose config is
+        unchanged keep their instance and cached results; changed modules are
+        re-created (right away if they were already in use, else on first use);
+        modules removed from the file are dropped. Modules registered in code
+        are kept. Raises, leaving the current modules untouched, when the new
+        config is invalid.
+        """
+        with self._write_lock:
+            self._config_stat = self._stat_config()
+            config = load_config_from_yaml(self.config_path)
+            configs = load_module_config(config)
+            settings = load_manager_config(config)
+            pipeline_configs = load_pipeline_config(config)
+            self._load_plugins(settings)
+
+            old = self._registry
+            old_configs = {module_config.name: module_config for module_config in self.configs}
+            new = ModuleRegistry({}, {}, {}, {})
+            result = ReloadResult()
+            for module_config in configs:
+                name = module_config.name
+                if name in new.order:
+                    raise ValueError(f"Module {name} already registered")
+                execution_policy(module_config)
+                new.order[name] = None
+                if name in old.order and old_configs.get(name) == module_config:
+                    if name in old.index:
+                        new.index[name] = old.index[name]
+                    else:
+                        new.pending[name] = old.pending[name]
+                    if name in old.caches:
+                        new.caches[name] = old.caches[name]
+                    continue
+                (result.changed if name in old_configs else result.added).append(name)
+                self._set_cache(new, name, module_config)
+                if name in old.index:
+                    new.index[name] = self._build(module_config)
+                else:
+                    new.pending[name] = module_config
+            result.removed = [name for name in old_configs if name in old.order and name not in new.order]
+            # Modules registered in code rather than in the file
+            for name in old.order:
+                if name not in old_configs and name not in new.order:
+                    new.order[name] = None
+                    new.index[name] = old.index[name]
+                    if name in old.caches:
+                        new.caches[name] = old.caches[name]
+            pipelines = self._build_pipelines(pipeline_configs, new.order)
+
+            self._registry = new
+            self._pipelines = pipelines
+            self.configs = configs
+            self.settings = settings
+            self.pipeline_configs = pipeline_configs
+        logger.info(f"Reloaded {self.config_path}: added {result.added}, changed {result.changed}, removed {result.removed}")
+        return result
+
+    def reload_if_changed(self) -> Optional[ReloadResult]:
+        """
+        Reload the config file if its mtime or size changed since it was last read.
+        """
+        if self._stat_config() == self._config_stat:
+            return None
+        return self.reload()
+
+    def watch(self, interval: float = 1.0):
+        """
+        Poll the config file every interval seconds in a background thread and
+        reload it when it changes. A config that fails to load is logged and
+        the current modules stay in place until the file changes again.
+        """
+        if self._watcher is not None:
+            return
+        self._stop_watching.clear()
+        self._watcher = threading.Thread(target=self._watch, args=(interval,), daemon=True)
+        self._watcher.start()
+
+    def _watch(self, interval: float):
+        while not self._stop_watching.wait(interval):
+            try:
+                self.reload_if_changed()
+            except Exception as e:
+                logger.error(f"Failed to reload {self.config_path}: {e}")
+
+    def stop_watching(self):
+        """Stop the config watcher, if one is running."""
+        if self._watcher is not None:
+            self._stop_watching.set()
+            self._watcher.join()
+            self._watcher = None
+
+    @property
+    def modules(self) -> list[BaseModule]:
+        return self.get_modules()
+
+    def warmup(self, module_names: Optional[Iterable[str]] = None) -> list[BaseModule]:
+        """
+        Create the given modules now instead of on first use (all when None).
+        """
+        if module_names is None:
+            module_names = list(self._registry.pending)
+        return [self.get_module(name) for name in module_names]
 
     def register_module(self, module: BaseModule):
-        self.modules.append(module)
+        """
+        Register a module under its name. Raises if the name is taken.
+        """
+        name = module.name()
+        with self._write_lock:
+            registry = self._registry
+            if name in registry.order:
+                raise ValueError(f"Module {name} already registered")
+            self._set_cache(registry, name, module.config)
+            registry.order[name] = None
+            registry.index[name] = module
+
+    def replace_module(self, module: BaseModule):
+        """
+        Register a module, replacing any module registered under the same name.
+        """
+        name = module.name()
+        with self._write_lock:
+            registry = self._registry
+            self._set_cache(registry, name, module.config)
+            registry.pending.pop(name, None)
+            registry.order.setdefault(name, None)
+            registry.index[name] = module
+
+    def unregister_module(self, module_name: str) -> BaseModule | ModuleConfig:
+        """
+        Remove a module by name and return it, or its config if it was never created.
+        """
+        with self._write_lock:
+            registry = self._registry
+            if module_name not in registry.order:
+                raise ValueError(f"Module {module_name} not found")
+            del registry.order[module_name]
+            registry.caches.pop(module_name, None)
+            if module_name in registry.pending:
+                return registry.pending.pop(module_name)
+            return registry.index.pop(module_name)
 
     def execute_module(self, module_name: str, **kwargs):
-        for module in self.modules:
-            if module.name() == module_name:
-                return module.execute(**kwargs)
+        registry = self._registry
+        try:
+            module = registry.index[module_name]
+        except KeyError:
+            module = self._create(module_name)
+        cache = registry.caches.get(module_name)
+        if cache is None:
+            return module.execute(**kwargs)
+        key = cache.key(kwargs)
+        if key is None:
+            return module.execute(**kwargs)
+        result = cache.get(key)
+        if result is MISSING:
+            result = module.execute(**kwargs)
+            cache.put(key, result)
+        return result
+
+    def _execute_module_hooked(self, module_name: str, **kwargs):
+        """Execute a module with the registered hooks called around it."""
+        hooks = self._hooks
+        contexts = [hook.before(module_name, kwargs) for hook in hooks]
+        start = perf_counter()
+        try:
+            result = ModuleManager.execute_module(self, module_name, **kwargs)
+        except Exception as e:
+            seconds = perf_counter() - start
+            for hook, context in zip(hooks, contexts):
+                hook.after(module_name, context, seconds, e)
+            raise
+        seconds = perf_counter() - start
+        for hook, context in zip(hooks, contexts):
+            hook.after(module_name, context, seconds, None)
+        return result
+
+    def add_hook(self, hook: ModuleHook):
+        """
+        Call hook.before/hook.after around every execute_module call.
+        """
+        with self._write_lock:
+            if hook not in self._hooks:
+                self._hooks = (*self._hooks, hook)
+            # The instance attribute takes precedence over the class method; remove_hook
+            # deletes it again, so a manager without hooks never looks at self._hooks
+            self.execute_module = self._execute_module_hooked
+
+    def remove_hook(self, hook: ModuleHook):
+        """
+        Stop calling a hook; the last removal restores the plain execute_module.
+        """
+        with self._write_lock:
+            self._hooks = tuple(registered for registered in self._hooks if registered is not hook)
+            if not self._hooks:
+                self.__dict__.pop("execute_module", None)
+
+    def enable_metrics(self):
+        """Start recording metrics for execute_module."""
+        if self.metrics is None:
+            self.metrics = ModuleMetrics()
+        self.add_hook(self.metrics)
+
+    def disable_metrics(self):
+        """Stop recording metrics; recorded stats are kept until reset_stats()."""
+        if self.metrics is not None:
+            self.remove_hook(self.metrics)
+
+    def stats(self) -> dict[str, ModuleStats]:
+        """Get a snapshot of per-module call counts, error counts and latency histograms."""
+        return self.metrics.snapshot() if self.metrics is not None else {}
+
+    def reset_stats(self):
+        """Clear all recorded metrics."""
+        if self.metrics is not None:
+            self.metrics.reset()
+
+    def execute_batch(self, module_name: str, kwargs_list: list[dict]) -> list:
+        """
+        Execute a module once per kwargs dict and return the results in order.
+        The module is resolved once and the calls go through its execute_batch
+        hook; with a result cache only the misses are executed. The first
+        failure raises for the whole batch.
+        """
+        registry = self._registry
+        try:
+            module = registry.index[module_name]
+        except KeyError:
+            module = self._create(module_name)
+        cache = registry.caches.get(module_name)
+        if cache is None:
+            return module.execute_batch(kwargs_list)
+        results = []
+        misses = []
+        for kwargs in kwargs_list:
+            key = cache.key(kwargs)
+            result = cache.get(key) if key is not None else MISSING
+            if result is MISSING:
+                misses.append((len(results), key, kwargs))
+            results.append(result)
+        if misses:
+            computed = module.execute_batch([kwargs for _, _, kwargs in misses])
+            for (position, key, _), result in zip(misses, computed):
+                results[position] = result
+                if key is not None:
+                    cache.put(key, result)
+        return results
+
+    def stream_batch(self, module_name: str, kwargs_iterable: Iterable[dict], chunk_size: int = 1024) -> Iterator:
+        """
+        Like execute_batch, but consumes the kwargs lazily in chunks of
+        chunk_size and yields the results as each chunk completes.
+        """
+        iterator = iter(kwargs_iterable)
+        while chunk := list(itertools.islice(iterator, chunk_size)):
+            yield from self.execute_batch(module_name, chunk)
 
     def get_module(self, module_name: str) -> BaseModule:
-        for module in self.modules:
-            if module.name() == module_name:
-                return module
-        raise ValueError(f"Module {module_name} not found")
+        try:
+            return self._registry.index[module_name]
+        except KeyError:
+            return self._create(module_name)
     
     def get_modules(self) -> list[BaseModule]:
-        return self.modules
\ No newline at end of file
+        return [self.get_module(name) for name in list(self._registry.order)]
+
+    def _build_pipelines(self, configs: list[PipelineConfig], order: dict[str, None]) -> dict[str, Pipeline]:
+        pipelines = {}
+        for config in configs:
+            if config.name in pipelines:
+                raise ValueError(f"Pipeline {config.name} already registered")
+            pipelines[config.name] = self._check_pipeline(Pipeline(self, config), order)
+        return pipelines
+
+    def add_pipeline(self, config: PipelineConfig) -> Pipeline:
+        """
+        Register a pipeline under its name. Raises if a stage names an unknown module.
+        """
+        if config.name in self._pipelines:
+            raise ValueError(f"Pipeline {config.name} already registered")
+        pipeline = self._pipelines[config.name] = self._check_pipeline(Pipeline(self, config), self._registry.order)
+        return pipeline
+
+    @staticmethod
+    def _check_pipeline(pipeline: Pipeline, order: dict[str, None]) -> Pipeline:
+        for stage in pipeline.config.stages:
+            if stage.module not in order:
+                raise ValueError(f"Pipeline {pipeline.config.name}: module {stage.module} not found")
+        return pipeline
+
+    def pipeline(self, name: str, stages: Optional[list[StageConfig | dict]] = None,
+                 batch_size: int = 1, queue_size: int = 8) -> Pipeline:
+        """
+        Return the pipeline registered under name, or build an unregistered one from stages.
+        """
+        if stages is not None:
+            return self._check_pipeline(build_pipeline(self, name, stages, batch_size, queue_size), self._registry.order)
+        try:
+            return self._pipelines[name]
+        except KeyError:
+            raise ValueError(f"Pipeline {name} not found") from None
+
+    def run_pipeline(self, name: str, items: Iterable) -> Iterator:
+        """
+        Stream items through a registered pipeline, yielding its results in input order.
+        """
+        return self.pipeline(name).run(items)
+
+    def cache_stats(self) -> dict[str, CacheStats]:
+        """
+        Return the result cache counters of every module that caches results.
+        """
+        return {name: cache.stats() for name, cache in self._registry.caches.items()}
+
+    def invalidate_cache(self, module_name: Optional[str] = None):
+        """
+        Drop the cached results of one module, or of every module when None.
+        """
+        registry = self._registry
+        if module_name is None:
+            for cache in registry.caches.values():
+                cache.clear()
+        elif module_name in registry.caches:
+            registry.caches[module_name].clear()
+        elif module_name not in registry.order:
+            raise ValueError(f"Module {module_name} not found")
+
+    def _timeout_for(self, module: BaseModule, request: ModuleRequest, timeout: Optional[float]) -> Optional[float]:
+        """Request timeout, else the module's args.timeout, else the call or configured default."""
+        if request.timeout is not None:
+            return request.timeout
+        module_timeout = module.config.args.get("timeout") if module.config.args else None
+        if module_timeout is not None:
+            return module_timeout
+        return timeout if timeout is not None else self.settings.default_timeout
+
+    async def _run_request(self, index: int, request: ModuleRequest, semaphore: "asyncio.Semaphore",
+                           timeout: Optional[float]) -> ModuleResult:
+        # asyncio is imported in the coroutines, where an event loop has already loaded it
+        import asyncio
+        async with semaphore:
+            try:
+                module = self.get_module(request.module_name)
+                cache = self._registry.caches.get(request.module_name)
+                key = cache.key(request.kwargs) if cache is not None else None
+                result = cache.get(key) if key is not None else MISSING
+                if result is MISSING:
+                    result = await asyncio.wait_for(
+                        module.execute_async(**request.kwargs),
+                        self._timeout_for(module, request, timeout)
+                    )
+                    if key is not None:
+                        cache.put(key, result)
+                return ModuleResult(index, request.module_name, result=result)
+            except Exception as e:
+                return ModuleResult(index, request.module_name, error=e)
+
+    async def execute_many(self, requests: Iterable[ModuleRequest], max_concurrency: Optional[int] = None,
+                           timeout: Optional[float] = None) -> list[ModuleResult]:
+        """
+        Execute requests concurrently, at most max_concurrency at a time, and
+        return their results in request order. Failures and timeouts are
+        reported in ModuleResult.error; cancelling the call cancels every
+        request still running.
+        """
+        import asyncio
+        semaphore = asyncio.Semaphore(max_concurrency or self.settings.max_concurrency)
+        async with asyncio.TaskGroup() as group:
+            tasks = [
+                group.create_task(self._run_request(index, request, semaphore, timeout))
+                for index, request in enumerate(requests)
+            ]
+        return [task.result() for task in tasks]
+
+    async def execute_as_completed(self, requests: Iterable[ModuleRequest], max_concurrency: Optional[int] = None,
+                                   timeout: Optional[float] = None) -> AsyncIterator[ModuleResult]:
+        """
+        Like execute_many, but yields each result as soon as it completes.
+        Closing the iterator early cancels the requests still running.
+        """
+        import asyncio
+        semaphore = asyncio.Semaphore(max_concurrency or self.settings.max_concurrency)
+        tasks = [
+            asyncio.create_task(self._run_request(index, request, semaphore, timeout))
+            for index, request in enumerate(requests)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,123 @@
+from typing import Optional
+import ast
+import json
+import logging
+import os
+import sys
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Entry point group under which installed distributions publish module types:
+#   [project.entry-points."module_manager.modules"]
+#   shout = "shout_plugin.modules:Shout"
+ENTRY_POINT_GROUP = "module_manager.modules"
+MANIFEST_VERSION = 1
+
+def default_manifest_path() -> str:
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__", "module_plugins.json")
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+def _plugin_files(plugins_dir: str) -> list[str]:
+    return sorted(
+        entry for entry in os.listdir(plugins_dir)
+        if entry.endswith(".py") and not entry.startswith("_")
+    )
+
+def manifest_key(plugins_dir: Optional[str], entry_points: bool) -> dict:
+    """
+    Describes everything discovery depends on, using stats only. Installing,
+    upgrading or removing a distribution adds or renames its dist-info
+    directory, which changes the mtime of its sys.path entry; editing a
+    plugin file changes its own mtime.
+    """
+    key = {"version": MANIFEST_VERSION, "python": sys.version, "entry_points": entry_points}
+    if entry_points:
+        key["sys_path"] = [[entry, _mtime_ns(entry)] for entry in sys.path if entry and os.path.isdir(entry)]
+    if plugins_dir is not None:
+        plugins_dir = os.path.abspath(plugins_dir)
+        key["plugins_dir"] = [plugins_dir, _mtime_ns(plugins_dir)]
+        key["plugin_files"] = [
+            [entry, _mtime_ns(os.path.join(plugins_dir, entry))] for entry in _plugin_files(plugins_dir)
+        ]
+    return key
+
+def _module_type(node: ast.ClassDef) -> Optional[str]:
+    """
+    Returns the module type a BaseModule subclass is registered under: its
+    module_type class attribute if it sets one as a literal, else its
+    lowercased class name. Returns None for other classes.
+    """
+    is_module = any(
+        (isinstance(base, ast.Name) and base.id == "BaseModule")
+        or (isinstance(base, ast.Attribute) and base.attr == "BaseModule")
+        for base in node.bases
+    )
+    if not is_module:
+        return None
+    for statement in node.body:
+        if (isinstance(statement, ast.Assign) and len(statement.targets) == 1
+                and isinstance(statement.targets[0], ast.Name) and statement.targets[0].id == "module_type"
+                and isinstance(statement.value, ast.Constant) and isinstance(statement.value.value, str)):
+            return statement.value.value
+    return node.name.lower()
+
+def scan_plugins(plugins_dir: Optional[str], entry_points: bool) -> dict[str, str]:
+    """
+    Finds plugin module types without importing them. Returns module type
+    to "package.module:Class" import string; plugins directory files are
+    importable by their file name once the directory is on sys.path.
+    """
+    plugins = {}
+    if entry_points:
+        # Only imported on a manifest miss: importlib.metadata is slow to import
+        from importlib import metadata
+        for entry_point in metadata.entry_points(group=ENTRY_POINT_GROUP):
+            plugins[entry_point.name] = entry_point.value
+    if plugins_dir is not None:
+        for entry in _plugin_files(plugins_dir):
+            path = os.path.join(plugins_dir, entry)
+            try:
+                with open(path, "rb") as file:
+                    tree = ast.parse(file.read(), filename=path)
+            except (OSError, SyntaxError, ValueError) as e:
+                logger.warning(f"Skipping plugin file {path}: {e}")
+                continue
+            for node in tree.body:
+                if isinstance(node, ast.ClassDef) and (module_type := _module_type(node)) is not None:
+                    plugins[module_type] = f"{entry[:-3]}:{node.name}"
+    return plugins
+
+def discover_plugins(plugins_dir: Optional[str] = None, entry_points: bool = True,
+                     manifest_path: Optional[str] = None) -> dict[str, str]:
+    """
+    Returns the plugin module types from the on-disk manifest when its key
+    still matches, and only scans (and rewrites the manifest) when it does not.
+    """
+    if plugins_dir is not None and not os.path.isdir(plugins_dir):
+        raise FileNotFoundError(f"Plugins directory not found: {plugins_dir}")
+    manifest_path = manifest_path or default_manifest_path()
+    key = manifest_key(plugins_dir, entry_points)
+    try:
+        with open(manifest_path) as file:
+            manifest = json.load(file)
+        if manifest["key"] == key:
+            return manifest["plugins"]
+    except (OSError, ValueError, KeyError, TypeError):
+        pass
+
+    plugins = scan_plugins(os.path.abspath(plugins_dir) if plugins_dir is not None else None, entry_points)
+    try:
+        os.makedirs(os.path.dirname(manifest_path), exist_ok=True)
+        temp_path = f"{manifest_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as file:
+            json.dump({"key": key, "plugins": plugins}, file)
+        os.replace(temp_path, manifest_path)
+    except OSError as e:
+        logger.warning(f"Could not write plugin manifest {manifest_path}: {e}")
+    return plugins
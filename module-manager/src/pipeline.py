@@ -0,0 +1,161 @@
+from module_config import PipelineConfig, StageConfig
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
+import itertools
+import queue
+import threading
+
+if TYPE_CHECKING:
+    from module_manager import ModuleManager
+
+# Marks the end of a stream in a stage queue
+_DONE = object()
+# How often blocked workers check whether the pipeline was stopped
+_POLL_SECONDS = 0.1
+
+class Pipeline:
+    """
+    Streams items through a chain of modules. Each stage runs in its own
+    worker threads and hands batches to the next stage through a bounded
+    queue, so a slow stage holds back the ones before it. Results are
+    yielded in input order, batches finished out of turn waiting in a
+    reorder buffer; the input is only read while fewer than queue_size
+    batches per queue are between it and the consumer, so a stalled batch
+    cannot let the rest of the input run ahead. The first error stops the
+    pipeline and is raised to the consumer; closing the result iterator
+    early stops it too.
+    """
+    def __init__(self, manager: "ModuleManager", config: PipelineConfig):
+        if not config.stages:
+            raise ValueError(f"Pipeline {config.name} has no stages")
+        if config.batch_size < 1 or config.queue_size < 1:
+            raise ValueError(f"Pipeline {config.name} needs a positive batch_size and queue_size")
+        for stage in config.stages:
+            if stage.workers < 1:
+                raise ValueError(f"Pipeline {config.name}: stage {stage.module} needs at least one worker")
+        self.manager = manager
+        self.config = config
+
+    def run(self, items: Iterable) -> Iterator:
+        """
+        Returns an iterator over the output of the last stage for each item.
+        """
+        stages = self.config.stages
+        queues = [queue.Queue(self.config.queue_size) for _ in range(len(stages) + 1)]
+        stop = threading.Event()
+        errors: list[BaseException] = []
+        in_flight = threading.Semaphore(self.config.queue_size * len(queues))
+        threads = [threading.Thread(target=self._feed, args=(items, queues[0], stop, errors, in_flight), daemon=True)]
+        for stage, inbox, outbox in zip(stages, queues, queues[1:]):
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            threads += [
+                threading.Thread(target=self._work, args=(stage, inbox, outbox, stop, errors, remaining, lock), daemon=True)
+                for _ in range(stage.workers)
+            ]
+        for thread in threads:
+            thread.start()
+        return self._collect(queues[-1], stop, errors, threads, in_flight)
+
+    @staticmethod
+    def _put(target: queue.Queue, item, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    @staticmethod
+    def _get(source: queue.Queue, stop: threading.Event):
+        while not stop.is_set():
+            try:
+                return source.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                pass
+        return _DONE
+
+    def _fail(self, error: BaseException, stop: threading.Event, errors: list[BaseException]) -> None:
+        errors.append(error)
+        stop.set()
+
+    @staticmethod
+    def _acquire(in_flight: threading.Semaphore, stop: threading.Event) -> bool:
+        while not stop.is_set():
+            if in_flight.acquire(timeout=_POLL_SECONDS):
+                return True
+        return False
+
+    def _feed(self, items: Iterable, outbox: queue.Queue, stop: threading.Event, errors: list[BaseException],
+              in_flight: threading.Semaphore) -> None:
+        """Cuts the input into numbered batches for the first stage."""
+        try:
+            iterator = iter(items)
+            for sequence in itertools.count():
+                # Wait for room before reading the next batch from the input
+                if not self._acquire(in_flight, stop):
+                    break
+                batch = list(itertools.islice(iterator, self.config.batch_size))
+                if not batch or not self._put(outbox, (sequence, batch), stop):
+                    break
+            self._put(outbox, _DONE, stop)
+        except Exception as e:
+            self._fail(e, stop, errors)
+
+    def _work(self, stage: StageConfig, inbox: queue.Queue, outbox: queue.Queue, stop: threading.Event,
+              errors: list[BaseException], remaining: list[int], lock: threading.Lock) -> None:
+        """Runs one worker of a stage until its input ends or the pipeline stops."""
+        execute_batch = self.manager.execute_batch
+        try:
+            while True:
+                item = self._get(inbox, stop)
+                if item is _DONE:
+                    # Let sibling workers see the end of the stream too
+                    self._put(inbox, _DONE, stop)
+                    break
+                sequence, batch = item
+                if stage.input is None:
+                    results = execute_batch(stage.module, [{**stage.args, **value} for value in batch])
+                else:
+                    results = execute_batch(stage.module, [{**stage.args, stage.input: value} for value in batch])
+                if not self._put(outbox, (sequence, results), stop):
+                    return
+        except Exception as e:
+            self._fail(e, stop, errors)
+            return
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            self._put(outbox, _DONE, stop)
+
+    def _collect(self, outbox: queue.Queue, stop: threading.Event, errors: list[BaseException],
+                 threads: list[threading.Thread], in_flight: threading.Semaphore) -> Iterator:
+        """Yields results in input order, restoring the order of batches finished out of turn."""
+        finished: dict[int, list] = {}
+        next_sequence = 0
+        try:
+            while True:
+                item = self._get(outbox, stop)
+                if errors:
+                    raise errors[0]
+                if item is _DONE:
+                    break
+                sequence, results = item
+                finished[sequence] = results
+                while next_sequence in finished:
+                    yield from finished.pop(next_sequence)
+                    next_sequence += 1
+                    in_flight.release()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+def build_pipeline(manager: "ModuleManager", name: str, stages: list[StageConfig | dict[str, Any]],
+                   batch_size: int = 1, queue_size: int = 8) -> Pipeline:
+    """
+    Builds a pipeline from stage configs, or dicts with the same keys as in config.yaml.
+    """
+    stage_configs = [stage if isinstance(stage, StageConfig) else StageConfig(**stage) for stage in stages]
+    return Pipeline(manager, PipelineConfig(name, stage_configs, batch_size, queue_size))
@@ -0,0 +1,112 @@
+from base_module import BaseModule
+from module_config import ModuleConfig
+from module_factory import ModuleFactory
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional
+import asyncio
+import logging
+import threading
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Modules built in this worker process, kept warm between calls
+_worker_modules: dict[str, tuple[ModuleConfig, BaseModule]] = {}
+
+def _worker_module(config: ModuleConfig) -> BaseModule:
+    """
+    Returns the module built in this worker, building it from its config on
+    first use (or again when the config changed).
+    """
+    cached = _worker_modules.get(config.name)
+    if cached is None or cached[0] != config:
+        cached = _worker_modules[config.name] = (config, ModuleFactory.create_module(config))
+    return cached[1]
+
+def _execute_in_worker(config: ModuleConfig, kwargs: dict):
+    """
+    Runs a module call inside a worker.
+    """
+    return _worker_module(config).execute(**kwargs)
+
+def _execute_batch_in_worker(config: ModuleConfig, kwargs_list: list[dict]) -> list:
+    """
+    Runs a whole batch inside one worker, in a single round trip.
+    """
+    return _worker_module(config).execute_batch(kwargs_list)
+
+class ModuleProcessPool:
+    """
+    Pool of worker processes for CPU-bound modules. Only the module config
+    and call kwargs are pickled per call. When a worker crashes the pool is
+    detected as broken, the failing call raises, and a fresh pool is started
+    for the calls that follow.
+    """
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers
+        self.restarts = 0
+        self._lock = threading.Lock()
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(self, config: ModuleConfig, kwargs: dict) -> Future:
+        """
+        Schedules a module call on a worker.
+        """
+        return self._submit(_execute_in_worker, config, kwargs)
+
+    def submit_batch(self, config: ModuleConfig, kwargs_list: list[dict]) -> Future:
+        """
+        Schedules a batch of calls to one module on a single worker.
+        """
+        return self._submit(_execute_batch_in_worker, config, kwargs_list)
+
+    def _submit(self, function, *args) -> Future:
+        executor = self._executor
+        try:
+            future = executor.submit(function, *args)
+        except BrokenProcessPool:
+            self._restart(executor)
+            future = self._executor.submit(function, *args)
+        future.add_done_callback(lambda done: self._check(executor, done))
+        return future
+
+    def _check(self, executor: ProcessPoolExecutor, future: Future) -> None:
+        if not future.cancelled() and isinstance(future.exception(), BrokenProcessPool):
+            self._restart(executor)
+
+    def _restart(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Replaces a broken executor, once, however many calls noticed it.
+        """
+        with self._lock:
+            if self._executor is not broken:
+                return
+            logger.warning("Module worker crashed, restarting the process pool")
+            broken.shutdown(wait=False, cancel_futures=True)
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self.restarts += 1
+
+    def shutdown(self) -> None:
+        self._executor.shutdown()
+
+class ProcessModule(BaseModule):
+    """
+    Stands in for a module whose execution policy is "process": calls are
+    forwarded to the module built inside a pool worker.
+    """
+    def __init__(self, config: ModuleConfig, pool: ModuleProcessPool):
+        super().__init__(config)
+        self.pool = pool
+
+    def name(self) -> str:
+        return self.config.name
+
+    def execute(self, **kwargs):
+        return self.pool.submit(self.config, kwargs).result()
+
+    def execute_batch(self, kwargs_list: list[dict]) -> list:
+        return self.pool.submit_batch(self.config, kwargs_list).result()
+
+    async def execute_async(self, **kwargs):
+        return await asyncio.wrap_future(self.pool.submit(self.config, kwargs))
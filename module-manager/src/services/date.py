@@ -10,4 +10,8 @@ class Date(BaseModule):
         return self.config.name
 
     def execute(self, **kwargs) -> str:
-        return datetime.now().strftime("%Y-%m-%d")
\ No newline at end of file
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def execute_batch(self, kwargs_list: list[dict]) -> list[str]:
+        # One clock read for the whole batch
+        return [self.execute()] * len(kwargs_list)
\ No newline at end of file
@@ -9,4 +9,7 @@ class Echo(BaseModule):
         return self.config.name
 
     def execute(self, **kwargs) -> str:
-        return kwargs['message']
\ No newline at end of file
+        return kwargs['message']
+
+    def execute_batch(self, kwargs_list: list[dict]) -> list[str]:
+        return [kwargs['message'] for kwargs in kwargs_list]
\ No newline at end of file
@@ -9,4 +9,7 @@ class Greet(BaseModule):
         return self.config.name
 
     def execute(self, **kwargs) -> str:
-        return kwargs['greeting']
\ No newline at end of file
+        return kwargs['greeting']
+
+    def execute_batch(self, kwargs_list: list[dict]) -> list[str]:
+        return [kwargs['greeting'] for kwargs in kwargs_list]
\ No newline at end of file
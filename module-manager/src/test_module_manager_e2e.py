@@ -1,19 +1,49 @@
 import pytest
+import asyncio
+import itertools
 import os
 import sys
+import time
 from datetime import datetime
 from unittest.mock import patch
 
 # Add the src directory to the path so we can import modules
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from module_manager import ModuleManager
-from module_config import load_config_from_yaml
+from module_manager import ModuleManager, ModuleRequest
+from base_module import BaseModule
+from module_factory import ModuleFactory
+from module_config import load_config_from_yaml, ModuleConfig
 from services.greet import Greet
 from services.echo import Echo
 from services.date import Date
 
 
+class Sleep(BaseModule):
+    """Async module that sleeps for the requested number of seconds."""
+    def name(self) -> str:
+        return self.config.name
+    
+    def execute(self, **kwargs) -> str:
+        time.sleep(kwargs["seconds"])
+        return f"slept {kwargs['seconds']}"
+    
+    async def execute_async(self, **kwargs) -> str:
+        await asyncio.sleep(kwargs["seconds"])
+        return f"slept {kwargs['seconds']}"
+
+
+class Pid(BaseModule):
+    """CPU-side module that reports which process ran it, or crashes it."""
+    def name(self) -> str:
+        return self.config.name
+    
+    def execute(self, **kwargs) -> str:
+        if kwargs.get("crash"):
+            os._exit(1)
+        return str(os.getpid())
+
+
 class TestModuleManagerE2E:
     """End-to-end tests for the module manager system."""
     
@@ -96,9 +126,464 @@ class TestModuleManagerE2E:
             module_manager.get_module("nonexistent")
     
     def test_execute_nonexistent_module(self, module_manager):
-        """Test that executing a non-existent module returns None."""
-        result = module_manager.execute_module("nonexistent")
-        assert result is None
+        """Test that executing a non-existent module raises an error."""
+        with pytest.raises(ValueError, match="Module nonexistent not found"):
+            module_manager.execute_module("nonexistent")
+    
+    def test_duplicate_module_registration(self, module_manager):
+        """Test that registering a second module under a taken name raises an error."""
+        with pytest.raises(ValueError, match="Module echo already registered"):
+            module_manager.register_module(Echo(ModuleConfig("echo", "Echo again", {})))
+    
+    def test_replace_and_unregister_module(self, module_manager):
+        """Test replacing and unregistering modules keeps lookups consistent."""
+        replacement = Greet(ModuleConfig("greet", "Greet again", {}))
+        module_manager.replace_module(replacement)
+        assert module_manager.get_module("greet") is replacement
+        assert len(module_manager.get_modules()) == 3
+        
+        removed = module_manager.unregister_module("greet")
+        assert removed is replacement
+        assert [module.name() for module in module_manager.get_modules()] == ["echo", "date"]
+        with pytest.raises(ValueError, match="Module greet not found"):
+            module_manager.execute_module("greet", greeting="Hi")
+        with pytest.raises(ValueError, match="Module greet not found"):
+            module_manager.unregister_module("greet")
+    
+    def test_lazy_module_creation(self, module_manager):
+        """Test that modules are created on first use or warmup, not at startup."""
+        assert module_manager._registry.index == {}
+        
+        module_manager.execute_module("echo", message="Hi")
+        assert list(module_manager._registry.index) == ["echo"]
+        
+        warmed = module_manager.warmup(["date"])
+        assert [module.name() for module in warmed] == ["date"]
+        assert sorted(module_manager._registry.index) == ["date", "echo"]
+        
+        module_manager.warmup()
+        assert sorted(module_manager._registry.index) == ["date", "echo", "greet"]
+    
+    def test_factory_import_string_registration(self, monkeypatch):
+        """Test that module types registered as import strings are imported on first create."""
+        monkeypatch.setitem(ModuleFactory._module_registry, "shout", "services.echo:Echo")
+        module = ModuleFactory.create_module(ModuleConfig("shout", "Echo loudly", {}))
+        assert isinstance(module, Echo)
+        assert ModuleFactory._module_registry["shout"] is Echo
+        
+        monkeypatch.setitem(ModuleFactory._module_registry, "broken", "services.missing:Nothing")
+        with pytest.raises(ValueError, match="Cannot import module type broken"):
+            ModuleFactory.create_module(ModuleConfig("broken", "Broken", {}))
+    
+    def test_execute_many_in_request_order(self, module_manager):
+        """Test concurrent execution returns results in request order, with errors captured."""
+        module_manager.register_module(Sleep(ModuleConfig("sleep", "Sleep", {})))
+        requests = [
+            ModuleRequest("sleep", {"seconds": 0.05}),
+            ModuleRequest("echo", {"message": "sync module in a thread"}),
+            ModuleRequest("sleep", {"seconds": 0.01}),
+            ModuleRequest("nonexistent"),
+            ModuleRequest("sleep", {"seconds": 1}, timeout=0.01),
+        ]
+        results = asyncio.run(module_manager.execute_many(requests, max_concurrency=4))
+        
+        assert [result.index for result in results] == [0, 1, 2, 3, 4]
+        assert results[0].result == "slept 0.05"
+        assert results[1].result == "sync module in a thread"
+        assert isinstance(results[3].error, ValueError)
+        assert isinstance(results[4].error, TimeoutError)
+    
+    def test_execute_as_completed(self, module_manager):
+        """Test results are yielded in completion order under a concurrency limit."""
+        module_manager.register_module(Sleep(ModuleConfig("sleep", "Sleep", {"timeout": 0.02})))
+        requests = [ModuleRequest("sleep", {"seconds": seconds}) for seconds in (0.05, 0.001, 0.01)]
+        
+        async def collect():
+            return [result async for result in module_manager.execute_as_completed(requests)]
+        
+        results = asyncio.run(collect())
+        assert [result.index for result in results] == [1, 2, 0]
+        # args.timeout from the module config applies when the request sets none
+        assert isinstance(results[2].error, TimeoutError)
+    
+    def test_process_execution_policy(self, tmp_path, monkeypatch):
+        """Test process-mode modules run in warm workers that are restarted after a crash."""
+        monkeypatch.setitem(ModuleFactory._module_registry, "pid", Pid)
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "module-manager:\n"
+            "  process_workers: 1\n"
+            "  modules:\n"
+            "    - name: pid\n"
+            "      description: Report the worker pid\n"
+            "      args:\n"
+            "        execution: process\n"
+        )
+        manager = ModuleManager(str(config_path))
+        try:
+            worker_pid = manager.execute_module("pid")
+            assert worker_pid != str(os.getpid())
+            assert manager.execute_module("pid") == worker_pid
+            assert manager.execute_batch("pid", [{}] * 3) == [worker_pid] * 3
+            
+            results = asyncio.run(manager.execute_many([ModuleRequest("pid"), ModuleRequest("pid", {"crash": True})]))
+            assert results[0].result == worker_pid
+            assert results[1].error is not None
+            
+            restarted_pid = manager.execute_module("pid")
+            assert restarted_pid != worker_pid
+            assert manager.process_pool().restarts == 1
+        finally:
+            manager.close()
+    
+    def test_unknown_execution_policy(self, tmp_path):
+        """Test that an unknown execution policy is rejected at startup."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "module-manager:\n"
+            "  modules:\n"
+            "    - name: echo\n"
+            "      description: Echo\n"
+            "      args:\n"
+            "        execution: gpu\n"
+        )
+        with pytest.raises(ValueError, match="Unknown execution policy for module echo: gpu"):
+            ModuleManager(str(config_path))
+    
+    def test_result_cache(self, module_manager):
+        """Test per-module result caching, its counters and invalidation."""
+        with patch.object(Echo, "execute", autospec=True, side_effect=lambda self, **kwargs: kwargs["message"]) as execute:
+            assert module_manager.execute_module("echo", message="hi") == "hi"
+            assert module_manager.execute_module("echo", message="hi") == "hi"
+            assert module_manager.execute_module("echo", message="bye") == "bye"
+            assert execute.call_count == 2
+            
+            stats = module_manager.cache_stats()["echo"]
+            assert (stats.hits, stats.misses, stats.size) == (1, 2, 2)
+            
+            module_manager.invalidate_cache("echo")
+            assert module_manager.execute_module("echo", message="hi") == "hi"
+            assert execute.call_count == 3
+        
+        # Async calls share the same cache
+        results = asyncio.run(module_manager.execute_many([ModuleRequest("echo", {"message": "hi"})]))
+        assert results[0].result == "hi"
+        assert module_manager.cache_stats()["echo"].hits == 2
+        with pytest.raises(ValueError, match="Module missing not found"):
+            module_manager.invalidate_cache("missing")
+    
+    def test_result_cache_expiry(self, tmp_path):
+        """Test that ttl entries expire and the daily policy expires at midnight."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "module-manager:\n"
+            "  modules:\n"
+            "    - name: echo\n"
+            "      description: Echo\n"
+            "      args:\n"
+            "        cache: ttl\n"
+            "        cache_ttl: 60\n"
+            "        cache_size: 1\n"
+        )
+        manager = ModuleManager(str(config_path))
+        with patch("module_cache.time.time", return_value=1000.0):
+            manager.execute_module("echo", message="a")
+            manager.execute_module("echo", message="a")
+        with patch("module_cache.time.time", return_value=1061.0):
+            manager.execute_module("echo", message="a")
+            manager.execute_module("echo", message="b")
+        stats = manager.cache_stats()["echo"]
+        assert (stats.hits, stats.misses, stats.evictions, stats.size) == (1, 3, 1, 1)
+        
+        from module_cache import MISSING, ModuleCache
+        cache = ModuleCache("daily")
+        before_midnight = datetime(2026, 3, 1, 23, 59, 59).timestamp()
+        with patch("module_cache.time.time", return_value=before_midnight):
+            key = cache.key({})
+        # The call finishes after midnight: its result belongs to the day it started
+        with patch("module_cache.time.time", return_value=before_midnight + 2):
+            cache.put(key, "yesterday")
+            assert cache.get(cache.key({})) is MISSING
+            assert cache.get(key) is MISSING
+        expires_at = datetime.fromtimestamp(cache._entries[key][1])
+        assert expires_at == datetime(2026, 3, 2)
+    
+    def test_invalid_cache_policy(self, tmp_path):
+        """Test that cache misconfiguration is rejected at startup."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "module-manager:\n"
+            "  modules:\n"
+            "    - name: echo\n"
+            "      description: Echo\n"
+            "      args:\n"
+            "        cache: ttl\n"
+        )
+        with pytest.raises(ValueError, match="Module echo: The ttl cache policy requires a positive cache_ttl"):
+            ModuleManager(str(config_path))
+    
+    def test_configured_pipeline(self, module_manager):
+        """Test streaming items through the echo -> greet pipeline from config.yaml."""
+        messages = (f"message {i}" for i in range(1000))
+        results = module_manager.run_pipeline("echo_greet", messages)
+        assert list(results) == [f"message {i}" for i in range(1000)]
+        with pytest.raises(ValueError, match="Pipeline missing not found"):
+            module_manager.pipeline("missing")
+    
+    def test_pipeline_api(self, module_manager):
+        """Test an API-built pipeline keeps input order across parallel workers and stops on errors."""
+        module_manager.register_module(Sleep(ModuleConfig("sleep", "Sleep", {})))
+        pipeline = module_manager.pipeline("slow", [
+            {"module": "sleep", "input": "seconds", "workers": 4},
+            {"module": "echo", "input": "message"},
+        ], batch_size=2, queue_size=2)
+        delays = [0.02, 0.0, 0.01, 0.0] * 5
+        assert list(pipeline.run(delays)) == [f"slept {delay}" for delay in delays]
+        
+        failing = module_manager.pipeline("failing", [{"module": "echo"}])
+        with pytest.raises(KeyError):
+            list(failing.run([{"message": "ok"}, {}]))
+        
+        # Closing the iterator early stops the workers
+        results = pipeline.run(iter(lambda: 0.0, None))
+        assert next(results) == "slept 0.0"
+        results.close()
+    
+    def test_pipeline_backpressure(self, module_manager):
+        """Test that a stalled batch on a multi-worker stage keeps input consumption bounded."""
+        module_manager.register_module(Sleep(ModuleConfig("sleep", "Sleep", {})))
+        pipeline = module_manager.pipeline("stalled", [
+            {"module": "sleep", "input": "seconds", "workers": 2},
+        ], batch_size=1, queue_size=2)
+        consumed = []
+        def items():
+            for index in itertools.count():
+                consumed.append(index)
+                yield 0.5 if index == 0 else 0.0
+        
+        results = pipeline.run(items())
+        assert next(results) == "slept 0.5"
+        # At most queue_size batches per queue (input and output) were read ahead
+        assert len(consumed) <= 2 * 2
+        results.close()
+    
+    def test_pipeline_unknown_module(self, tmp_path):
+        """Test that pipelines naming unknown modules are rejected at startup."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "module-manager:\n"
+            "  modules: []\n"
+            "  pipelines:\n"
+            "    - name: broken\n"
+            "      stages:\n"
+            "        - module: echo\n"
+        )
+        with pytest.raises(ValueError, match="Pipeline broken: module echo not found"):
+            ModuleManager(str(config_path))
+    
+    def test_reload_config(self, tmp_path):
+        """Test that a reload re-creates only changed modules and keeps the rest warm."""
+        config_path = tmp_path / "config.yaml"
+        def write_config(greeting: str, extra_module: str = ""):
+            config_path.write_text(
+                "module-manager:\n"
+                "  modules:\n"
+                "    - name: echo\n"
+                "      description: Echo\n"
+                "      args:\n"
+                "        cache: pure\n"
+                "    - name: greet\n"
+                "      description: Greet\n"
+                "      args:\n"
+                f"        greeting: {greeting}\n"
+                + extra_module
+            )
+        write_config("Hello", "    - name: date\n      description: Date\n      args: {}\n")
+        manager = ModuleManager(str(config_path))
+        manager.register_module(Sleep(ModuleConfig("sleep", "Sleep", {})))
+        echo = manager.get_module("echo")
+        greet = manager.get_module("greet")
+        manager.execute_module("echo", message="hi")
+        assert manager.reload_if_changed() is None
+        
+        write_config("Hi")
+        result = manager.reload()
+        assert (result.added, result.changed, result.removed) == ([], ["greet"], ["date"])
+        assert manager.get_module("echo") is echo
+        assert manager.cache_stats()["echo"].size == 1
+        assert manager.get_module("greet") is not greet
+        assert manager.get_module("greet").config.args["greeting"] == "Hi"
+        assert [module.name() for module in manager.get_modules()] == ["echo", "greet", "sleep"]
+        with pytest.raises(ValueError, match="Module date not found"):
+            manager.execute_module("date")
+        
+        # An invalid config leaves the current modules in place
+        config_path.write_text("module-manager:\n  modules:\n    - name: echo\n      description: Echo\n      args:\n        execution: gpu\n")
+        with pytest.raises(ValueError, match="Unknown execution policy"):
+            manager.reload()
+        assert manager.get_module("echo") is echo
+    
+    def test_watch_config(self, tmp_path):
+        """Test that the watcher applies edits to the config file."""
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text("module-manager:\n  modules: []\n")
+        manager = ModuleManager(str(config_path))
+        manager.watch(interval=0.01)
+        try:
+            config_path.write_text("module-manager:\n  modules:\n    - name: echo\n      description: Echo\n      args: {}\n")
+            stat = os.stat(config_path)
+            os.utime(config_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            deadline = time.monotonic() + 5
+            while not manager.configs and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert manager.execute_module("echo", message="reloaded") == "reloaded"
+        finally:
+            manager.close()
+    
+    def test_execute_batch(self, module_manager):
+        """Test batched execution, its cache use and the default execute_batch hook."""
+        messages = [{"message": f"message {i}"} for i in range(5)]
+        module_manager.execute_module("echo", message="message 2")
+        with patch.object(Echo, "execute_batch", autospec=True,
+                          side_effect=lambda self, kwargs_list: [kwargs["message"] for kwargs in kwargs_list]) as execute_batch:
+            assert module_manager.execute_batch("echo", messages) == [f"message {i}" for i in range(5)]
+            # Only the cache misses reach the module, in a single call
+            execute_batch.assert_called_once()
+            assert len(execute_batch.call_args.args[1]) == 4
+        
+        module_manager.register_module(Sleep(ModuleConfig("sleep", "Sleep", {})))
+        assert module_manager.execute_batch("sleep", [{"seconds": 0}, {"seconds": 0.0}]) == ["slept 0", "slept 0.0"]
+        
+        greetings = ({"greeting": f"Hello {i}"} for i in range(2500))
+        streamed = module_manager.stream_batch("greet", greetings, chunk_size=1000)
+        assert next(streamed) == "Hello 0"
+        assert list(streamed)[-1] == "Hello 2499"
+        with pytest.raises(ValueError, match="Module missing not found"):
+            module_manager.execute_batch("missing", [{}])
+    
+    def test_metrics_and_tracing_hooks(self, module_manager, tmp_path):
+        """Test per-module metrics, span tracing hooks and their removal."""
+        from module_hooks import SpanFileHook
+        assert module_manager.stats() == {}
+        module_manager.enable_metrics()
+        spans = SpanFileHook(str(tmp_path / "spans.jsonl"))
+        module_manager.add_hook(spans)
+        
+        module_manager.execute_module("echo", message="hi")
+        module_manager.execute_module("echo", message="hi")
+        with pytest.raises(KeyError):
+            module_manager.execute_module("greet")
+        
+        stats = module_manager.stats()
+        assert stats["echo"].calls == 2
+        assert stats["greet"].calls == 1
+        assert stats["greet"].errors == {"KeyError": 1}
+        assert 0 < stats["echo"].percentile(50) <= stats["echo"].percentile(99) < float("inf")
+        
+        module_manager.remove_hook(spans)
+        module_manager.disable_metrics()
+        spans.close()
+        assert "execute_module" not in vars(module_manager)
+        module_manager.execute_module("echo", message="untraced")
+        assert module_manager.stats()["echo"].calls == 2
+        
+        import json
+        lines = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+        assert [(span["module"], span["error"] is None) for span in lines] == [("echo", True), ("echo", True), ("greet", False)]
+        assert all(span["duration_ms"] >= 0 for span in lines)
+    
+    def test_module_fleet(self, config_path):
+        """Test the worker fleet: routing, pipelining, errors and worker restarts."""
+        from module_fleet import Supervisor
+        with Supervisor(config_path, workers=2, check_interval=0.05) as supervisor:
+            client = supervisor.client(routing="sticky", pool_size=2)
+            assert client.execute_module("echo", message="hi") == "hi"
+            calls = [("echo", {"message": f"m{i}"}) if i % 2 else ("greet", {"greeting": f"g{i}"}) for i in range(100)]
+            assert client.execute_pipelined(calls) == [f"m{i}" if i % 2 else f"g{i}" for i in range(100)]
+            with pytest.raises(KeyError):
+                client.execute_module("greet")
+            with pytest.raises(ValueError, match="Module missing not found"):
+                client.execute_module("missing")
+            
+            balanced = supervisor.client(routing="balanced")
+            assert balanced.execute_pipelined([("echo", {"message": "x"})] * 10) == ["x"] * 10
+            
+            # A killed worker is restarted and pooled connections to it are replaced
+            for process in supervisor._processes:
+                process.kill()
+            deadline = time.monotonic() + 30
+            while supervisor.restarts < 2 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert client.execute_module("echo", message="back") == "back"
+            assert client.execute_module("greet", greeting="back") == "back"
+            client.close()
+            balanced.close()
+    
+    def test_plugin_discovery(self, tmp_path, monkeypatch, request):
+        """Test plugins directory discovery, the cached manifest and lazy plugin imports."""
+        import module_plugins
+        plugins_dir = tmp_path / "plugins"
+        plugins_dir.mkdir()
+        # Registered plugin types, the plugins directory on sys.path and the
+        # imported plugin module are all undone after the test
+        monkeypatch.setattr(ModuleFactory, "_module_registry", dict(ModuleFactory._module_registry))
+        monkeypatch.syspath_prepend(str(plugins_dir))
+        request.addfinalizer(lambda: sys.modules.pop("shout_plugin", None))
+        plugin = plugins_dir / "shout_plugin.py"
+        plugin.write_text(
+            "from base_module import BaseModule\n"
+            "class Yell(BaseModule):\n"
+            "    def name(self):\n"
+            "        return self.config.name\n"
+            "    def execute(self, **kwargs):\n"
+            "        return kwargs['message'].upper()\n"
+            "class Quiet(BaseModule):\n"
+            "    module_type = 'whisper'\n"
+            "    def name(self):\n"
+            "        return self.config.name\n"
+            "    def execute(self, **kwargs):\n"
+            "        return kwargs['message'].lower()\n"
+        )
+        manifest_path = str(tmp_path / "manifest.json")
+        assert module_plugins.discover_plugins(str(plugins_dir), entry_points=False, manifest_path=manifest_path) == {
+            "yell": "shout_plugin:Yell", "whisper": "shout_plugin:Quiet"
+        }
+        # A warm start reads the manifest without scanning
+        with patch.object(module_plugins, "scan_plugins", side_effect=AssertionError("re-scanned")):
+            module_plugins.discover_plugins(str(plugins_dir), entry_points=False, manifest_path=manifest_path)
+            stat = os.stat(plugin)
+            os.utime(plugin, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            with pytest.raises(AssertionError, match="re-scanned"):
+                module_plugins.discover_plugins(str(plugins_dir), entry_points=False, manifest_path=manifest_path)
+        
+        assert ModuleFactory.load_plugins(str(plugins_dir), entry_points=False, manifest_path=manifest_path) == ["yell", "whisper"]
+        assert "shout_plugin" not in sys.modules
+        config_path = tmp_path / "config.yaml"
+        config_path.write_text(
+            "module-manager:\n"
+            "  plugins_dir: plugins\n"
+            "  modules:\n"
+            "    - name: yell\n"
+            "      description: Shout\n"
+            "      args: {}\n"
+        )
+        manager = ModuleManager(str(config_path))
+        assert manager.execute_module("yell", message="hi") == "HI"
+        assert "shout_plugin" in sys.modules
+        with pytest.raises(FileNotFoundError, match="Plugins directory not found"):
+            ModuleFactory.load_plugins(str(tmp_path / "missing"))
+    
+    def test_benchmark_suite(self, monkeypatch):
+        """Test the scaling benchmark on a small config and its regression check."""
+        import bench_module_manager
+        monkeypatch.setattr(ModuleFactory, "_module_registry", dict(ModuleFactory._module_registry))
+        registered = set(ModuleFactory._module_registry)
+        metrics = bench_module_manager.run_suite([10], calls=100, repeat=1)
+        assert {"10.load_config_from_yaml.ms", "10.init.ms", "10.execute_module.last.ns"} <= set(metrics)
+        assert all(value > 0 for value in metrics.values())
+        assert set(ModuleFactory._module_registry) == registered
+        regressions = bench_module_manager.compare({"a": 120.0, "b": 100.0}, {"a": 100.0, "b": 100.0}, threshold=0.10)
+        assert regressions == ["a: 100.0 -> 120.0 (+20.0%)"]
     
     def test_config_loading(self, config_path):
         """Test that the configuration file loads correctly."""